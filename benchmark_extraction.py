@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+P360 Extraction Benchmarks
+Measures extractor throughput and peak memory on synthetic documents,
+optionally failing when results regress against a saved baseline
+"""
+
+import sys
+import argparse
+import json
+import multiprocessing
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from extraction import ExtractionOptions, extract_file
+from extraction.metrics import peak_rss_bytes
+from extraction.synthetic import make_deck, make_pdf, make_workbook
+
+SCRIPT_DIR = Path(__file__).parent
+# Importing the CLI must stay cheap: backends load only for the files that need them
+STARTUP_BUDGET_MS = 250
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "PyPDF2", "pptx", "pyarrow")
+
+_STARTUP_PROBE = """
+import sys, time
+start = time.perf_counter()
+import extract_client_docs
+elapsed = time.perf_counter() - start
+print(elapsed * 1000)
+print(" ".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+def measure_startup(repeat):
+    """Median milliseconds to import the CLI in a fresh interpreter, and any heavy modules it pulled in"""
+    probe = _STARTUP_PROBE.format(heavy=HEAVY_MODULES)
+    timings = []
+    loaded = set()
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", probe], cwd=SCRIPT_DIR,
+                                capture_output=True, text=True, check=True).stdout.splitlines()
+        timings.append(float(output[0]))
+        loaded.update(output[1].split() if len(output) > 1 else ())
+    return {
+        "import_ms": round(statistics.median(timings), 1),
+        "heavy_modules": sorted(loaded),
+    }
+
+def check_startup(startup, budget_ms):
+    """Problems with the measured startup: over budget or eagerly importing a backend"""
+    problems = []
+    if startup["import_ms"] > budget_ms:
+        problems.append(f"startup: import took {startup['import_ms']} ms (budget {budget_ms} ms)")
+    if startup["heavy_modules"]:
+        problems.append(f"startup: imported {', '.join(startup['heavy_modules'])} eagerly")
+    return problems
+
+def benchmark_cases(scale=1.0):
+    """
+    The benchmark matrix, with sizes multiplied by scale: tuples of
+    (case name, extractor, generator kwargs, unit name, units in the document)
+    """
+    def n(value):
+        return max(1, int(value * scale))
+    
+    cases = []
+    for pages in (n(20), n(200)):
+        cases.append((f"pdf-{pages}p", "pdf", {"pages": pages}, "pages", pages))
+    for sheets, rows, cols in ((2, n(2000), 10), (4, n(20000), 12)):
+        cases.append((f"excel-{sheets}x{rows}x{cols}", "excel",
+                      {"sheets": sheets, "rows": rows, "cols": cols}, "rows", sheets * rows))
+    for slides in (n(20), n(200)):
+        cases.append((f"pptx-{slides}s", "pptx", {"slides": slides}, "slides", slides))
+    return cases
+
+GENERATORS = {
+    "pdf": (make_pdf, ".pdf"),
+    "excel": (make_workbook, ".xlsx"),
+    "pptx": (make_deck, ".pptx"),
+}
+
+def _measure(path, extractor, output_path):
+    """Run in a fresh process: one uncached extraction, timed"""
+    start = time.perf_counter()
+    result = extract_file(path, output_path, extractor, options=ExtractionOptions())
+    elapsed = time.perf_counter() - start
+    if result.error:
+        raise RuntimeError(result.error)
+    return elapsed, peak_rss_bytes()
+
+def run_case(case, work_dir, repeat):
+    """Generate the case's document, extract it repeat times, keep the fastest run"""
+    name, extractor, params, unit, units = case
+    make, suffix = GENERATORS[extractor]
+    source = make(Path(work_dir) / f"{name}{suffix}", **params)
+    output_path = Path(work_dir) / f"{name}.md"
+    
+    # A spawned process per run so peak RSS reflects this case alone
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        with context.Pool(1) as pool:
+            runs.append(pool.apply(_measure, (str(source), extractor, str(output_path))))
+    
+    elapsed = min(run[0] for run in runs)
+    peak = max(run[1] or 0 for run in runs)
+    return {
+        "case": name,
+        "unit": unit,
+        "units": units,
+        "input_bytes": source.stat().st_size,
+        "seconds": round(elapsed, 4),
+        "units_per_sec": round(units / elapsed, 2),
+        "peak_rss_mb": round(peak / (1024 * 1024), 1),
+    }
+
+def compare(results, baseline, tolerance):
+    """Regressions against a baseline: slower throughput or higher peak memory beyond tolerance"""
+    previous = {item["case"]: item for item in baseline["results"]}
+    regressions = []
+    for item in results:
+        before = previous.get(item["case"])
+        if before is None:
+            continue
+        if item["units_per_sec"] < before["units_per_sec"] * (1 - tolerance):
+            regressions.append(f"{item['case']}: {item['units_per_sec']} {item['unit']}/s "
+                               f"(baseline {before['units_per_sec']})")
+        if item["peak_rss_mb"] > before["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{item['case']}: peak {item['peak_rss_mb']} MB "
+                               f"(baseline {before['peak_rss_mb']} MB)")
+    return regressions
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="P360 Extraction Benchmarks")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply document sizes by this factor (default: 1.0)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per case; the fastest is reported (default: 3)")
+    parser.add_argument("--only", action="append", choices=sorted(GENERATORS),
+                        help="Only benchmark these extractors (repeatable)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path,
+                        help="Compare against a previous --output file and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown / memory growth versus the baseline (default: 0.2)")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS,
+                        help=f"Fail if importing the CLI takes longer, in ms (default: {STARTUP_BUDGET_MS})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the benchmark matrix"""
+    args = parse_args(argv)
+    
+    print("P360 Extraction Benchmarks")
+    print("=" * 40)
+    
+    startup = measure_startup(max(args.repeat, 5))
+    print(f"{'startup':<24} {startup['import_ms']:>10.1f} ms import  "
+          f"(budget {args.startup_budget:g} ms)")
+    startup_problems = check_startup(startup, args.startup_budget)
+    
+    cases = [case for case in benchmark_cases(args.scale)
+             if not args.only or case[1] in args.only]
+    results = []
+    
+    with tempfile.TemporaryDirectory(prefix="p360-bench-") as work_dir:
+        for case in cases:
+            item = run_case(case, work_dir, args.repeat)
+            results.append(item)
+            print(f"{item['case']:<24} {item['units_per_sec']:>10.1f} {item['unit']}/s  "
+                  f"{item['seconds']:>8.3f}s  peak {item['peak_rss_mb']:>7.1f} MB")
+    
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "scale": args.scale,
+        "startup": startup,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📊 Results written to: {args.output}")
+    
+    if startup_problems:
+        print("\n❌ Startup over budget:")
+        for line in startup_problems:
+            print(f"   {line}")
+        return False
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"   {line}")
+            return False
+        print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -4,144 +4,131 @@ P360 Client Documents Extractor
 Extracts content from Excel and PDF files for comprehensive analysis
 """
 
-import os
 import sys
+import argparse
+from dataclasses import replace
 from pathlib import Path
-import pandas as pd
-import PyPDF2
-from openpyxl import load_workbook
 
-def extract_excel_content(excel_path, output_path):
+from extraction import (
+    ExtractionCache,
+    ExtractionJob,
+    ExtractionOptions,
+    Manifest,
+    parse_page_range,
+    SearchIndex,
+    add_instrumentation_args,
+    discover_jobs,
+    extract_file,
+    run_profiled,
+    run_timed_batch,
+    slowest_units,
+    write_metrics_report,
+)
+
+def _finish(result, return_content):
+    """Return the string on request, otherwise the streamed output summary"""
+    if return_content:
+        return result.error if result.error else result.content
+    return result
+
+def extract_excel_content(excel_path, output_path, cache=None, return_content=False):
     """
     Extract content from Excel file including all sheets and tables
-    """
-    print(f"Extracting Excel content from: {excel_path}")
     
-    try:
-        # Read Excel file with pandas
-        excel_file = pd.ExcelFile(excel_path)
-        content = []
-        
-        content.append(f"# Excel File: {os.path.basename(excel_path)}")
-        content.append("=" * 50)
-        content.append("")
-        content.append(f"**Total Sheets**: {len(excel_file.sheet_names)}")
-        content.append("")
-        
-        for sheet_name in excel_file.sheet_names:
-            content.append(f"## Sheet: {sheet_name}")
-            content.append("-" * 30)
-            
-            try:
-                # Read the sheet
-                df = pd.read_excel(excel_path, sheet_name=sheet_name)
-                
-                # Basic info about the sheet
-                content.append(f"**Dimensions**: {df.shape[0]} rows × {df.shape[1]} columns")
-                content.append("")
-                
-                # Column headers
-                if not df.empty:
-                    content.append("**Columns**:")
-                    for col in df.columns:
-                        content.append(f"- {col}")
-                    content.append("")
-                    
-                    # First few rows of data (non-empty)
-                    content.append("**Sample Data**:")
-                    # Convert to string and handle NaN values
-                    df_string = df.head(10).fillna("").astype(str)
-                    content.append(df_string.to_string(index=False))
-                    content.append("")
-                    
-                    # If there are many rows, show summary stats
-                    if len(df) > 10:
-                        content.append(f"**Total Records**: {len(df)} (showing first 10)")
-                        content.append("")
-                        
-                        # Show unique values in key columns if they exist
-                        for col in df.columns:
-                            if df[col].dtype == 'object' and len(df[col].unique()) < 20:
-                                unique_vals = [str(val) for val in df[col].unique() if str(val) != 'nan' and str(val) != '']
-                                if unique_vals:
-                                    content.append(f"**{col} - Unique Values**: {', '.join(unique_vals[:10])}")
-                
-                else:
-                    content.append("*Sheet is empty*")
-                
-            except Exception as e:
-                content.append(f"Error reading sheet {sheet_name}: {str(e)}")
-            
-            content.append("")
-        
-        full_content = "\n".join(content)
-        
-        # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(full_content)
-        
-        return full_content
-        
-    except Exception as e:
-        error_msg = f"Error extracting Excel content: {str(e)}"
-        print(error_msg)
-        return error_msg
+    The Markdown is streamed to output_path; the full text is only held in
+    memory and returned when return_content is set.
+    """
+    options = ExtractionOptions(cache=cache)
+    result = extract_file(excel_path, output_path, "excel", options=options,
+                          return_content=return_content)
+    return _finish(result, return_content)
 
-def extract_pdf_content(pdf_path, output_path):
+def extract_pdf_content(pdf_path, output_path, workers=1, cache=None, return_content=False,
+                        pages=None):
     """
     Extract text content from PDF file
-    """
-    print(f"Extracting PDF content from: {pdf_path}")
     
-    try:
-        content = []
-        content.append(f"# PDF File: {os.path.basename(pdf_path)}")
-        content.append("=" * 50)
-        content.append("")
-        
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            total_pages = len(pdf_reader.pages)
-            
-            content.append(f"**Total Pages**: {total_pages}")
-            content.append("")
-            
-            for page_num in range(total_pages):
-                content.append(f"## Page {page_num + 1}")
-                content.append("-" * 20)
-                
-                try:
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    
-                    if text.strip():
-                        content.append(text.strip())
-                    else:
-                        content.append("(No extractable text content)")
-                        
-                except Exception as e:
-                    content.append(f"Error extracting page {page_num + 1}: {str(e)}")
-                
-                content.append("")
-        
-        full_content = "\n".join(content)
-        
-        # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(full_content)
-        
-        return full_content
-        
-    except Exception as e:
-        error_msg = f"Error extracting PDF content: {str(e)}"
-        print(error_msg)
-        return error_msg
+    With workers > 1 the pages are sharded across a process pool and the
+    page sections are reassembled in document order. When a cache is
+    given, an unchanged file (or an identical copy) is not re-parsed and
+    only pages whose content changed are re-extracted. Pages are streamed
+    to output_path as they arrive; the full text is only returned when
+    return_content is set. pages limits extraction to a 1-based inclusive
+    (first, last) range.
+    """
+    options = ExtractionOptions(workers=workers, cache=cache, pages=pages)
+    result = extract_file(pdf_path, output_path, "pdf", options=options,
+                          return_content=return_content)
+    return _finish(result, return_content)
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="P360 Client Documents Extractor")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of worker processes for PDF page extraction (default: 1)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-parse every file instead of reusing the extraction cache"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Re-extract files even if the manifest says their outputs are up to date"
+    )
+    parser.add_argument(
+        "--dir", type=Path,
+        help="Extract every supported file under this directory tree instead of the default file list"
+    )
+    parser.add_argument(
+        "--output-dir", type=Path,
+        help="Where extracted Markdown is written (default: documentation/)"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="Number of files extracted concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--pages", type=parse_page_range, metavar="FIRST-LAST",
+        help="Only extract this page range from PDFs, e.g. 10-40, 10- or 7"
+    )
+    parser.add_argument(
+        "--pdf-engine", choices=("text", "layout"), default="text",
+        help="PDF extraction engine: plain page text, or positioned blocks with tables rebuilt (default: text)"
+    )
+    parser.add_argument(
+        "--page-timeout", type=float, metavar="SECONDS",
+        help="Run PDF pages in supervised workers and skip any page taking longer than this"
+    )
+    parser.add_argument(
+        "--page-memory", type=int, metavar="MB",
+        help="Memory budget per supervised page worker; pages exceeding it are skipped"
+    )
+    parser.add_argument(
+        "--jsonl", action="store_true",
+        help="Also write <stem>.jsonl with one record per page, slide or sheet row"
+    )
+    parser.add_argument(
+        "--parquet", action="store_true",
+        help="Also write each Excel sheet to <stem>_parquet/ (requires pyarrow)"
+    )
+    parser.add_argument(
+        "--index", action="store_true",
+        help="Update the full-text search index with the extracted Markdown (see search_docs.py)"
+    )
+    add_instrumentation_args(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main extraction function"""
+    args = parse_args(argv)
+    return run_profiled(lambda: extract_documents(args), args.profile)
+
+def extract_documents(args):
+    """Extract the default file list, or every file under --dir"""
     script_dir = Path(__file__).parent
     client_docs_dir = script_dir / "clientDocs"
-    output_dir = script_dir / "documentation"
+    output_dir = args.output_dir or script_dir / "documentation"
     
     print("P360 Client Documents Extractor")
     print("=" * 40)
@@ -165,32 +152,56 @@ def main():
         }
     ]
     
+    if args.dir:
+        jobs = discover_jobs(args.dir, output_dir)
+        print(f"Discovered {len(jobs)} supported files under {args.dir}")
+    else:
+        jobs = [
+            ExtractionJob(
+                path=str(client_docs_dir / file_info["file"]),
+                output_path=str(output_dir / file_info["output"]),
+                extractor=file_info["type"]
+            )
+            for file_info in files_to_extract
+        ]
+    if args.pdf_engine == "layout":
+        jobs = [replace(job, extractor="pdf-layout") if job.extractor == "pdf" else job for job in jobs]
+    options = ExtractionOptions(
+        workers=args.workers,
+        cache=ExtractionCache(enabled=not args.no_cache),
+        jsonl=args.jsonl,
+        parquet=args.parquet,
+        pages=args.pages,
+        page_timeout=args.page_timeout,
+        page_memory_mb=args.page_memory
+    )
+    
+    manifest = Manifest(force=args.force or args.no_cache)
+    batch_results, report = run_timed_batch(jobs, options, jobs_in_parallel=args.jobs,
+                                            manifest=manifest)
+    
+    if args.dir:
+        removed = manifest.collect_garbage(args.dir)
+        manifest.save()
+        for path in removed:
+            print(f"🗑️  Removed output of deleted input: {path}")
     results = {}
     
-    for file_info in files_to_extract:
-        file_path = client_docs_dir / file_info["file"]
-        output_path = output_dir / file_info["output"]
-        
-        print(f"\nProcessing: {file_info['file']}")
-        
-        if not file_path.exists():
-            print(f"Warning: File not found - {file_path}")
+    for job, result in batch_results:
+        if result.error:
             continue
         
-        if file_info["type"] == "excel":
-            content = extract_excel_content(str(file_path), str(output_path))
-        elif file_info["type"] == "pdf":
-            content = extract_pdf_content(str(file_path), str(output_path))
-        else:
-            print(f"Unknown file type: {file_info['type']}")
-            continue
-        
-        results[file_info["file"]] = {
-            "output_file": str(output_path),
-            "content_preview": content[:500] + "..." if len(content) > 500 else content
+        results[Path(job.path).name] = {
+            "output_file": job.output_path,
+            "content_preview": result.preview
         }
         
-        print(f"✅ Extracted to: {output_path}")
+        if result.skipped:
+            print(f"⏭️  Up to date: {job.output_path}")
+        elif result.failed_units:
+            print(f"⚠️  Extracted to: {job.output_path} ({result.failed_units} page(s) skipped)")
+        else:
+            print(f"✅ Extracted to: {job.output_path}")
     
     # Summary
     print(f"\n{'='*50}")
@@ -202,6 +213,21 @@ def main():
         print(f"   Output: {result['output_file']}")
         print(f"   Preview: {result['content_preview'][:100]}...")
     
+    print()
+    for line in report.summary_lines():
+        print(line)
+    
+    if args.index and results:
+        with SearchIndex() as index:
+            stats = index.update_paths(result["output_file"] for result in results.values())
+        print(f"🔎 Search index: {stats['indexed']} updated, {stats['unchanged']} unchanged")
+    
+    if args.metrics:
+        write_metrics_report(args.metrics, batch_results, report)
+        print(f"📊 Metrics written to: {args.metrics}")
+        for unit in slowest_units(batch_results):
+            print(f"   {unit['wall_s']:.2f}s  {Path(unit['path']).name} {unit['kind']} {unit['number']}")
+    
     return len(results) > 0
 
 if __name__ == "__main__":
@@ -6,67 +6,55 @@ Extracts all text content from P360.pptx for analysis and POV creation
 
 import sys
 import os
+import argparse
 from pathlib import Path
 
-try:
-    from pptx import Presentation
-except ImportError:
-    print("python-pptx not installed. Installing...")
-    os.system("pip install python-pptx")
-    from pptx import Presentation
+from extraction import (
+    ExtractionJob,
+    ExtractionOptions,
+    Manifest,
+    add_instrumentation_args,
+    extract_file,
+    run_batch,
+    run_profiled,
+    write_metrics_report,
+)
 
-def extract_pptx_content(pptx_path, output_path=None):
+PRESENTATION_TITLE = "P360 Presentation Content Extraction"
+
+def extract_pptx_content(pptx_path, output_path=None, return_content=False):
     """
     Extract all text content from PowerPoint presentation
+    
+    Slides are streamed to output_path as they are read. The full text is
+    returned when return_content is set or when there is no output_path;
+    otherwise an ExtractionOutput summary is returned.
     """
     if not os.path.exists(pptx_path):
         print(f"Error: File {pptx_path} not found")
         return None
     
-    print(f"Extracting content from: {pptx_path}")
+    result = extract_file(pptx_path, output_path, "pptx",
+                          title=PRESENTATION_TITLE,
+                          options=ExtractionOptions(), return_content=return_content)
     
-    try:
-        prs = Presentation(pptx_path)
-        content = []
-        
-        content.append("# P360 Presentation Content Extraction")
-        content.append("=" * 50)
-        content.append("")
-        
-        for i, slide in enumerate(prs.slides, 1):
-            content.append(f"## Slide {i}")
-            content.append("-" * 20)
-            
-            # Extract text from all shapes in the slide
-            slide_text = []
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    slide_text.append(shape.text.strip())
-            
-            if slide_text:
-                content.extend(slide_text)
-            else:
-                content.append("(No text content)")
-            
-            content.append("")  # Empty line between slides
-        
-        # Join all content
-        full_content = "\n".join(content)
-        
-        # Save to file if output path provided
-        if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(full_content)
-            print(f"Content saved to: {output_path}")
-        
-        return full_content
-        
-    except Exception as e:
-        print(f"Error extracting content: {str(e)}")
+    if result.error:
         return None
+    
+    if output_path:
+        print(f"Content saved to: {output_path}")
+    
+    return result.content if result.content is not None else result
 
-def main():
+def main(argv=None):
     """Main function"""
+    parser = argparse.ArgumentParser(description="P360 PowerPoint Content Extractor")
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
+    return run_profiled(lambda: extract_presentation(args), args.profile)
+
+def extract_presentation(args):
+    """Extract P360.pptx unless its output is already up to date"""
     script_dir = Path(__file__).parent
     pptx_path = script_dir / "P360.pptx"
     output_path = script_dir / "documentation" / "P360_extracted_content.md"
@@ -74,13 +62,23 @@ def main():
     print("P360 PowerPoint Content Extractor")
     print("=" * 40)
     
-    content = extract_pptx_content(str(pptx_path), str(output_path))
+    # Skip the rewrite when the deck has not changed since the last run
+    job = ExtractionJob(path=str(pptx_path), output_path=str(output_path),
+                        extractor="pptx", title=PRESENTATION_TITLE)
+    results = run_batch([job], ExtractionOptions(), manifest=Manifest())
+    result = results[0][1]
+    
+    if args.metrics:
+        write_metrics_report(args.metrics, results)
+        print(f"📊 Metrics written to: {args.metrics}")
     
-    if content:
+    if not result.error:
+        if result.skipped:
+            print(f"{output_path} is up to date")
         print(f"\nExtraction completed successfully!")
         print(f"Content preview (first 500 chars):")
         print("-" * 40)
-        print(content[:500] + "..." if len(content) > 500 else content)
+        print(result.preview + "..." if result.chars_written > len(result.preview) else result.preview)
         print(f"\nFull content saved to: {output_path}")
         return True
     else:
@@ -3,63 +3,60 @@
 Extract SOW Document Content
 """
 
-import os
 import sys
+import argparse
 from pathlib import Path
-import PyPDF2
 
-def extract_sow_content():
-    """Extract content from SOW PDF"""
-    script_dir = Path(__file__).parent
-    sow_path = script_dir / "clientDocs" / "Pipeline360_SOW_Final.pdf"
-    output_path = script_dir / "documentation" / "P360_SOW_Final_extracted.md"
+from extraction import (
+    ExtractionCache,
+    ExtractionJob,
+    ExtractionOptions,
+    add_instrumentation_args,
+    extract_file,
+    run_profiled,
+    write_metrics_report,
+)
+
+SCRIPT_DIR = Path(__file__).parent
+SOW_PATH = SCRIPT_DIR / "clientDocs" / "Pipeline360_SOW_Final.pdf"
+OUTPUT_PATH = SCRIPT_DIR / "documentation" / "P360_SOW_Final_extracted.md"
+
+def extract_sow_content(cache=None, return_content=False):
+    """
+    Extract content from SOW PDF
+    
+    Pages are streamed to the output file; the full text is only returned
+    when return_content is set. Cache entries are shared with
+    extract_client_docs, so an identical copy of this PDF extracted there
+    is not parsed a second time.
+    """
+    options = ExtractionOptions(cache=cache or ExtractionCache())
+    result = extract_file(SOW_PATH, OUTPUT_PATH, "pdf",
+                          title="Pipeline360 SOW Final - Extracted Content",
+                          options=options, return_content=return_content)
+    
+    if result.error:
+        return result.error
+    
+    print(f"✅ SOW content extracted to: {OUTPUT_PATH}")
+    return result.content if return_content else result
+
+def main(argv=None):
+    """Extract the SOW, optionally with metrics and profiling"""
+    parser = argparse.ArgumentParser(description="Extract SOW Document Content")
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
     
-    print(f"Extracting SOW content from: {sow_path}")
+    result = run_profiled(extract_sow_content, args.profile)
+    if isinstance(result, str):
+        return False
     
-    try:
-        content = []
-        content.append("# Pipeline360 SOW Final - Extracted Content")
-        content.append("=" * 50)
-        content.append("")
-        
-        with open(sow_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            total_pages = len(pdf_reader.pages)
-            
-            content.append(f"**Total Pages**: {total_pages}")
-            content.append("")
-            
-            for page_num in range(total_pages):
-                content.append(f"## Page {page_num + 1}")
-                content.append("-" * 20)
-                
-                try:
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    
-                    if text.strip():
-                        content.append(text.strip())
-                    else:
-                        content.append("(No extractable text content)")
-                        
-                except Exception as e:
-                    content.append(f"Error extracting page {page_num + 1}: {str(e)}")
-                
-                content.append("")
-        
-        full_content = "\n".join(content)
-        
-        # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(full_content)
-        
-        print(f"✅ SOW content extracted to: {output_path}")
-        return full_content
-        
-    except Exception as e:
-        error_msg = f"Error extracting SOW content: {str(e)}"
-        print(error_msg)
-        return error_msg
+    if args.metrics:
+        job = ExtractionJob(path=str(SOW_PATH), output_path=str(OUTPUT_PATH), extractor="pdf")
+        write_metrics_report(args.metrics, [(job, result)])
+        print(f"📊 Metrics written to: {args.metrics}")
+    return True
 
 if __name__ == "__main__":
-    extract_sow_content()
+    success = main()
+    sys.exit(0 if success else 1)
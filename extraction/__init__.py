@@ -0,0 +1,59 @@
+"""
+P360 document extraction support package
+Shared helpers used by the extract_*.py entry points
+"""
+
+from .cache import EXTRACTOR_VERSION, ExtractionCache, file_digest, page_digest
+from .stream import ExtractionOutput, Section, stream_document, write_stream
+from .options import ExtractionOptions, parse_page_range
+from .metrics import (
+    Stopwatch,
+    add_instrumentation_args,
+    metrics_report,
+    run_profiled,
+    slowest_units,
+    write_metrics_report,
+)
+from .registry import Extractor, MissingBackendError, detect, extractors, get_extractor, register
+from .engine import ExtractionJob, extract_file, resolve_extractor
+from .manifest import Manifest
+from .batch import BatchReport, batch_report, discover_jobs, run_batch, run_timed_batch
+from .search_index import SearchHit, SearchIndex, split_units, tokenize
+
+__all__ = [
+    "BatchReport",
+    "EXTRACTOR_VERSION",
+    "ExtractionCache",
+    "ExtractionJob",
+    "ExtractionOptions",
+    "ExtractionOutput",
+    "Extractor",
+    "Manifest",
+    "MissingBackendError",
+    "SearchHit",
+    "SearchIndex",
+    "Section",
+    "Stopwatch",
+    "add_instrumentation_args",
+    "batch_report",
+    "detect",
+    "discover_jobs",
+    "extract_file",
+    "extractors",
+    "file_digest",
+    "get_extractor",
+    "metrics_report",
+    "page_digest",
+    "parse_page_range",
+    "register",
+    "resolve_extractor",
+    "run_batch",
+    "run_profiled",
+    "run_timed_batch",
+    "slowest_units",
+    "split_units",
+    "stream_document",
+    "tokenize",
+    "write_metrics_report",
+    "write_stream",
+]
@@ -0,0 +1,237 @@
+"""
+Batch scheduling
+================
+Discovers supported files under a directory tree and extracts them
+concurrently. Files are dispatched largest first (so the biggest file does
+not start last and stretch the tail) and admission is bounded by the
+total size of the files in flight, so a few huge inputs cannot all be
+parsed at once. Byte-identical inputs are extracted once and the copies
+are served from the cache afterwards. With a Manifest, inputs whose
+outputs are already up to date are skipped without being opened.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .cache import file_digest
+from .engine import ExtractionJob, extract_file
+from .manifest import Manifest
+from .options import ExtractionOptions
+from .registry import detect
+from .stream import ExtractionOutput
+
+# Default cap on the combined size of files being extracted at once
+DEFAULT_MAX_INFLIGHT_BYTES = 512 * 1024 * 1024
+
+OUTPUT_SUFFIX = "_extracted.md"
+
+
+@dataclass
+class BatchReport:
+    """Throughput of a batch run"""
+    files: int
+    failed: int
+    skipped: int
+    units: int
+    bytes_read: int
+    elapsed: float
+    
+    @property
+    def files_per_sec(self) -> float:
+        return (self.files - self.failed - self.skipped) / self.elapsed if self.elapsed else 0.0
+    
+    @property
+    def units_per_sec(self) -> float:
+        return self.units / self.elapsed if self.elapsed else 0.0
+    
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes_read / self.elapsed if self.elapsed else 0.0
+    
+    def summary_lines(self) -> List[str]:
+        return [
+            f"Files: {self.files} ({self.failed} failed, {self.skipped} unchanged) in {self.elapsed:.2f}s",
+            f"Throughput: {self.files_per_sec:.2f} files/s, "
+            f"{self.units_per_sec:.1f} pages/s, "
+            f"{self.bytes_per_sec / (1024 * 1024):.2f} MB/s",
+        ]
+
+
+def _output_names(filenames: List[str]) -> Dict[str, str]:
+    """
+    Output file name for each input file name in one directory:
+    <stem>_extracted.md, or <name>_extracted.md for files whose outputs
+    would otherwise clash (report.pdf and report.xlsx)
+    """
+    names = {filename: f"{Path(filename).stem}{OUTPUT_SUFFIX}" for filename in filenames}
+    while True:
+        owners: Dict[str, List[str]] = {}
+        for filename, name in names.items():
+            owners.setdefault(name, []).append(filename)
+        clashing = [filename for group in owners.values() if len(group) > 1 for filename in group]
+        if not clashing:
+            return names
+        # File names are unique, so each round settles at least one file
+        for filename in clashing:
+            names[filename] = f"{filename}{OUTPUT_SUFFIX}"
+
+
+def discover_jobs(root, output_dir) -> List[ExtractionJob]:
+    """
+    Build a job for every supported file under root. Outputs mirror the
+    input tree under output_dir as <stem>_extracted.md, keeping the
+    source suffix (<name>_extracted.md) where two files share a stem.
+    """
+    root = Path(root)
+    output_dir = Path(output_dir)
+    jobs = []
+    
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        supported = []
+        for filename in sorted(filenames):
+            if filename.startswith("."):
+                continue
+            extractor = detect(Path(dirpath) / filename)
+            if extractor is not None:
+                supported.append((filename, extractor))
+        
+        output_names = _output_names([filename for filename, _ in supported])
+        for filename, extractor in supported:
+            path = Path(dirpath) / filename
+            output_path = output_dir / path.relative_to(root).parent / output_names[filename]
+            jobs.append(ExtractionJob(
+                path=str(path),
+                output_path=str(output_path),
+                extractor=extractor.name
+            ))
+    
+    return jobs
+
+
+def _run_job(job: ExtractionJob, options: ExtractionOptions) -> ExtractionOutput:
+    if job.output_path:
+        Path(job.output_path).parent.mkdir(parents=True, exist_ok=True)
+    return extract_file(job.path, job.output_path, job.extractor, job.title,
+                        options, digest=job.digest)
+
+
+def _missing(job: ExtractionJob) -> ExtractionOutput:
+    print(f"Warning: File not found - {job.path}")
+    return ExtractionOutput(output_path=job.output_path, error=f"File not found: {job.path}")
+
+
+def _schedule(indexed_jobs: List[Tuple[int, ExtractionJob]], options: ExtractionOptions,
+              jobs_in_parallel: int, max_inflight_bytes: int) -> Dict[int, ExtractionOutput]:
+    """Run jobs on a process pool, largest first, within the in-flight byte budget"""
+    pending = sorted(indexed_jobs, key=lambda item: os.path.getsize(item[1].path), reverse=True)
+    results = {}
+    
+    with ProcessPoolExecutor(max_workers=jobs_in_parallel) as executor:
+        in_flight = {}
+        inflight_bytes = 0
+        
+        while pending or in_flight:
+            # Admit jobs while a worker is free and the byte budget allows;
+            # an oversized file is still admitted when nothing else is running.
+            while pending and len(in_flight) < jobs_in_parallel:
+                size = os.path.getsize(pending[0][1].path)
+                if in_flight and inflight_bytes + size > max_inflight_bytes:
+                    break
+                index, job = pending.pop(0)
+                in_flight[executor.submit(_run_job, job, options)] = (index, size)
+                inflight_bytes += size
+            
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, size = in_flight.pop(future)
+                inflight_bytes -= size
+                results[index] = future.result()
+    
+    return results
+
+
+def run_batch(jobs: List[ExtractionJob], options: Optional[ExtractionOptions] = None,
+              jobs_in_parallel: int = 1,
+              max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES,
+              manifest: Optional[Manifest] = None) -> List[Tuple[ExtractionJob, ExtractionOutput]]:
+    """
+    Extract every job, returning each job with its output summary in the
+    order the jobs were given. With jobs_in_parallel > 1 files run
+    concurrently and the page workers in options are shared out between them.
+    
+    With a manifest, jobs whose outputs are current are skipped (their
+    result has skipped=True) and successful extractions are recorded;
+    the manifest is saved before returning.
+    """
+    options = options or ExtractionOptions()
+    outcomes = {}
+    runnable = []
+    
+    for index, job in enumerate(jobs):
+        if not Path(job.path).exists():
+            outcomes[index] = _missing(job)
+        elif manifest is not None and manifest.is_current(job, options):
+            print(f"Unchanged, skipping: {job.path}")
+            outcomes[index] = manifest.skipped_output(job)
+        else:
+            runnable.append((index, job))
+    
+    # Only the first file with a given digest is parsed up front; its
+    # copies run afterwards and replay the cached result.
+    first_wave, second_wave = [], []
+    seen = set()
+    for index, job in runnable:
+        if options.cache_enabled:
+            job = replace(job, digest=job.digest or file_digest(job.path))
+            if job.digest in seen:
+                second_wave.append((index, job))
+                continue
+            seen.add(job.digest)
+        first_wave.append((index, job))
+    
+    if jobs_in_parallel > 1 and len(runnable) > 1:
+        file_options = replace(options, workers=max(1, options.workers // jobs_in_parallel))
+    else:
+        file_options = options
+    
+    for wave in (first_wave, second_wave):
+        if jobs_in_parallel > 1 and len(wave) > 1:
+            outcomes.update(_schedule(wave, file_options, jobs_in_parallel, max_inflight_bytes))
+        else:
+            for index, job in wave:
+                outcomes[index] = _run_job(job, options)
+    
+    if manifest is not None:
+        for index, job in first_wave + second_wave:
+            manifest.record(job, outcomes[index], options)
+        manifest.save()
+    
+    return [(job, outcomes[index]) for index, job in enumerate(jobs)]
+
+
+def batch_report(results: List[Tuple[ExtractionJob, ExtractionOutput]], elapsed: float) -> BatchReport:
+    """Summarise a batch run's throughput"""
+    succeeded = [result for _, result in results if not result.error]
+    return BatchReport(
+        files=len(results),
+        failed=len(results) - len(succeeded),
+        skipped=sum(1 for result in succeeded if result.skipped),
+        units=sum(result.units or 0 for result in succeeded),
+        bytes_read=sum(result.bytes_read for result in succeeded),
+        elapsed=elapsed,
+    )
+
+
+def run_timed_batch(jobs: List[ExtractionJob], options: Optional[ExtractionOptions] = None,
+                    jobs_in_parallel: int = 1,
+                    max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES,
+                    manifest: Optional[Manifest] = None):
+    """run_batch() plus a BatchReport of its wall-clock throughput"""
+    start = time.perf_counter()
+    results = run_batch(jobs, options, jobs_in_parallel, max_inflight_bytes, manifest)
+    return results, batch_report(results, time.perf_counter() - start)
@@ -0,0 +1,251 @@
+"""
+Content-hash extraction cache
+=============================
+Persistent on-disk cache for extracted Markdown, keyed by the SHA-256 of
+the input plus the extractor name and version. Whole documents are cached
+by file hash; PDF pages are additionally cached by the hash of their
+content stream and the resources it draws on, so an edited page is the
+only one that gets re-extracted.
+Engines that keep richer per-page data (such as positioned text blocks)
+cache it as binary blobs under the same page key.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+# Bump whenever the Markdown produced by an extractor changes shape so
+# stale cache entries are ignored instead of served.
+EXTRACTOR_VERSION = "6"
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".extraction-cache"
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path) -> str:
+    """SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Page attributes hashed besides the content streams. Layout blocks
+# record positions, so the page geometry is part of the key too.
+_PAGE_KEYS = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+# Digests of indirect objects already hashed, per open PDF reader. Fonts
+# and XObjects are usually shared by many pages and hashed only once.
+_reference_digests = weakref.WeakKeyDictionary()
+
+
+def _reference_digest(ref, memo: dict, active: set) -> bytes:
+    """Digest of the object an indirect reference points to, memoised per document"""
+    key = (ref.idnum, ref.generation)
+    if key in memo:
+        return memo[key]
+    if key in active:
+        # A reference back to an object still being hashed
+        return b"cycle"
+    active.add(key)
+    digest = hashlib.sha256()
+    _hash_object(digest, ref.get_object(), memo, active)
+    active.discard(key)
+    memo[key] = digest.digest()
+    return memo[key]
+
+
+def _hash_object(digest, obj, memo: dict, active: set):
+    """
+    Feed a canonical encoding of a PDF object into digest, following
+    indirect references, so the result does not depend on object numbering.
+    PyPDF2 objects are recognised by shape so importing this module does
+    not import PyPDF2.
+    """
+    if hasattr(obj, "idnum"):  # IndirectObject
+        digest.update(b"@" + _reference_digest(obj, memo, active))
+    elif hasattr(obj, "get_data"):  # StreamObject
+        digest.update(b"stream<<")
+        for name, value in sorted(obj.items()):
+            digest.update(f"{name}=".encode('utf-8'))
+            _hash_object(digest, value, memo, active)
+        # The stored bytes identify the stream as well as the decoded ones
+        # (its /Filter is hashed above) without decompressing font programs
+        data = getattr(obj, "_data", None)
+        if not isinstance(data, bytes):
+            data = obj.get_data()
+        digest.update(f">>{len(data)}:".encode('utf-8'))
+        digest.update(data)
+    elif isinstance(obj, dict):
+        digest.update(b"<<")
+        for name, value in sorted(obj.items()):
+            digest.update(f"{name}=".encode('utf-8'))
+            _hash_object(digest, value, memo, active)
+        digest.update(b">>")
+    elif isinstance(obj, list):
+        digest.update(b"[")
+        for value in obj:
+            _hash_object(digest, value, memo, active)
+        digest.update(b"]")
+    else:
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode('utf-8'))
+
+
+def page_digest(page) -> str:
+    """
+    SHA-256 hex digest of everything a PyPDF2 page's extracted text and
+    positioned blocks depend on: its content streams, its resolved
+    /Resources, including Form XObject streams (recursively) and full font
+    dictionaries with their encodings, /ToUnicode maps and widths, and its
+    geometry (/MediaBox, /CropBox, /Rotate, inherited ones included). Cheap
+    compared to extract_text(), which has to interpret the streams.
+    """
+    digest = hashlib.sha256()
+    contents = page.get("/Contents")
+    if contents is not None:
+        contents = contents.get_object()
+        # /Contents is either a single stream or an array of streams
+        streams = contents if isinstance(contents, list) else [contents]
+        for stream in streams:
+            digest.update(stream.get_object().get_data())
+    
+    reader = getattr(page, "pdf", None)
+    memo = _reference_digests.setdefault(reader, {}) if reader is not None else {}
+    for key in _PAGE_KEYS:
+        value = page.get(key)
+        if value is not None:
+            digest.update(f"{key}=".encode('utf-8'))
+            _hash_object(digest, value, memo, set())
+    
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Directory-backed cache of extracted documents and PDF pages"""
+    
+    def __init__(self, root=None, enabled: bool = True):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+    
+    def _entry_path(self, kind: str, extractor: str, digest: str) -> Path:
+        return self.root / kind / digest[:2] / f"{digest}.{extractor}-v{EXTRACTOR_VERSION}.md"
+    
+    def _read(self, path: Path) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text
+    
+    @contextmanager
+    def _atomic_writer(self, path: Path, binary: bool = False):
+        mode, encoding = ('wb', None) if binary else ('w', 'utf-8')
+        if not self.enabled:
+            with open(os.devnull, mode, encoding=encoding) as f:
+                yield f
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so concurrent workers never see
+        # a partially written entry.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode, encoding=encoding) as f:
+                yield f
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    def document_path(self, extractor: str, digest: str) -> Optional[Path]:
+        """Return the path of the cached Markdown body for a file digest, if present"""
+        if not self.enabled:
+            return None
+        path = self._entry_path("documents", extractor, digest)
+        if path.exists():
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+    
+    def document_writer(self, extractor: str, digest: str):
+        """
+        Context manager yielding a text file for the Markdown body of a file
+        digest; the entry only becomes visible if the block completes.
+        """
+        return self._atomic_writer(self._entry_path("documents", extractor, digest))
+    
+    def discard_document(self, extractor: str, digest: str):
+        """Remove a cached document and its side information"""
+        path = self._entry_path("documents", extractor, digest)
+        for entry in (path, path.with_suffix(".json")):
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                pass
+    
+    def document_meta(self, extractor: str, digest: str) -> dict:
+        """Side information (such as the page count) stored with a cached document"""
+        if not self.enabled:
+            return {}
+        path = self._entry_path("documents", extractor, digest).with_suffix(".json")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+    
+    def put_document_meta(self, extractor: str, digest: str, meta: dict):
+        """Store side information for a cached document"""
+        with self._atomic_writer(self._entry_path("documents", extractor, digest).with_suffix(".json")) as f:
+            json.dump(meta, f, default=str)
+    
+    def page_text(self, extractor: str, page) -> str:
+        """Return a PDF page's extracted text, reusing the cached copy if the page is unchanged"""
+        if not self.enabled:
+            return page.extract_text()
+        
+        path = self._entry_path("pages", extractor, page_digest(page))
+        text = self._read(path)
+        if text is None:
+            text = page.extract_text()
+            with self._atomic_writer(path) as f:
+                f.write(text)
+        return text
+    
+    def page_blob(self, extractor: str, page, build: Callable) -> bytes:
+        """
+        Return build(page) for a PDF page, reusing the cached bytes if the
+        page is unchanged. Entries share page_text's key, so anything build
+        reads from the page must be covered by page_digest.
+        """
+        if not self.enabled:
+            return build(page)
+        
+        path = self._entry_path("pages", extractor, page_digest(page)).with_suffix(".bin")
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            self.hits += 1
+            return data
+        except FileNotFoundError:
+            self.misses += 1
+        
+        data = build(page)
+        with self._atomic_writer(path, binary=True) as f:
+            f.write(data)
+        return data
@@ -0,0 +1,194 @@
+"""
+Column profiling
+================
+Profiles tabular data in a single pass over row chunks. Each chunk is
+turned into a DataFrame once and every column statistic (dtype, null
+count, cardinality, top values, min/max) is computed from vectorised
+pandas operations on it, then merged into running per-column totals.
+Distinct-value tracking stops at a cut-off so wide, high-cardinality
+sheets stay cheap; past that point top values are approximate.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+CHUNK_ROWS = 5000
+
+# Columns with more distinct values than this stop tracking exact values
+CARDINALITY_LIMIT = 20
+
+TOP_VALUES = 10
+
+# Heavy-hitter candidates kept per column once exact counting has stopped
+_APPROX_CANDIDATES = 100
+
+_NUMERIC_DTYPES = {"int64", "float64"}
+
+# pandas 2 reports text columns as object, pandas 3 as str
+_TEXT_DTYPES = {"object", "str", "string"}
+
+
+def _plain(value):
+    """Convert numpy scalars to plain Python values for JSON output"""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _merge_dtype(current: Optional[str], chunk: str) -> str:
+    if current is None or current == chunk:
+        return chunk
+    if {current, chunk} <= _NUMERIC_DTYPES:
+        return "float64"
+    if {current, chunk} <= _TEXT_DTYPES:
+        return "str" if "str" in (current, chunk) and "object" not in (current, chunk) else "object"
+    return "object"
+
+
+class ColumnProfile:
+    """Running statistics for one column"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.dtype: Optional[str] = None
+        self.count = 0
+        self.null_count = 0
+        # Exact value counts in first-seen order until the cardinality
+        # limit is passed; afterwards approximate heavy-hitter counts
+        self.value_counts: Dict[Any, int] = {}
+        self.exact = True
+        self.min = None
+        self.max = None
+    
+    def add_nulls(self, n: int):
+        """Account for rows that had no cell in this column"""
+        if n:
+            self.count += n
+            self.null_count += n
+            if self.exact:
+                self._merge_counts({None: n})
+    
+    def add_series(self, series: pd.Series):
+        nulls = series.isna()
+        null_count = int(nulls.sum())
+        self.count += len(series)
+        self.null_count += null_count
+        
+        if null_count < len(series):
+            # An all-null chunk says nothing about the column's type
+            self.dtype = _merge_dtype(self.dtype, str(series.dtype))
+            if not self.is_text:
+                self._merge_range(series.min(), series.max())
+        
+        counts = series.value_counts(dropna=False, sort=False)
+        if len(counts) > CARDINALITY_LIMIT:
+            # Cut off early: this column can no longer be summarised exactly,
+            # so only its heaviest values are worth merging
+            self.exact = False
+            counts = counts.nlargest(_APPROX_CANDIDATES)
+        self._merge_counts({(None if pd.isna(value) else value): int(n) for value, n in counts.items()})
+    
+    def _merge_range(self, low, high):
+        try:
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        except TypeError:
+            self.min = self.max = None
+    
+    def _merge_counts(self, counts: Dict[Any, int]):
+        for value, n in counts.items():
+            self.value_counts[value] = self.value_counts.get(value, 0) + n
+        
+        if self.exact and len(self.value_counts) > CARDINALITY_LIMIT:
+            self.exact = False
+        if not self.exact and len(self.value_counts) > _APPROX_CANDIDATES:
+            keep = sorted(self.value_counts.items(), key=lambda item: item[1], reverse=True)
+            self.value_counts = dict(keep[:_APPROX_CANDIDATES])
+    
+    @property
+    def is_text(self) -> bool:
+        """True for text and mixed-type columns"""
+        return self.dtype in _TEXT_DTYPES
+    
+    @property
+    def cardinality(self) -> Optional[int]:
+        """Number of distinct values (nulls included), or None past the limit"""
+        return len(self.value_counts) if self.exact else None
+    
+    def distinct_values(self) -> List[Any]:
+        """Distinct non-null values in first-seen order; only meaningful while exact"""
+        return [value for value in self.value_counts if value is not None]
+    
+    def top_values(self, n: int = TOP_VALUES):
+        ranked = sorted(((value, count) for value, count in self.value_counts.items() if value is not None),
+                        key=lambda item: item[1], reverse=True)
+        return ranked[:n]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "dtype": self.dtype or "float64",
+            "count": self.count,
+            "null_count": self.null_count,
+            "cardinality": self.cardinality,
+            "cardinality_limit": CARDINALITY_LIMIT,
+            "top_values": [[_plain(value), count] for value, count in self.top_values()],
+            "top_values_exact": self.exact,
+            "min": _plain(self.min),
+            "max": _plain(self.max),
+        }
+
+
+class TableProfiler:
+    """Buffers rows into chunks and profiles each chunk column-wise"""
+    
+    def __init__(self, chunk_rows: int = CHUNK_ROWS, on_chunk=None):
+        self.chunk_rows = chunk_rows
+        # Called with each chunk's DataFrame after it is profiled, so other
+        # consumers (Parquet output) reuse the same frame
+        self.on_chunk = on_chunk
+        self.columns: List[ColumnProfile] = []
+        self.rows = 0
+        self.width = 0
+        self._profiled_rows = 0
+        self._chunk: List[tuple] = []
+    
+    def add_row(self, row: tuple):
+        self._chunk.append(row)
+        self.rows += 1
+        self.width = max(self.width, len(row))
+        if len(self._chunk) >= self.chunk_rows:
+            self._flush()
+    
+    def _flush(self):
+        if not self._chunk:
+            return
+        width = max(len(row) for row in self._chunk)
+        while len(self.columns) < width:
+            column = ColumnProfile(str(len(self.columns)))
+            # Earlier rows had no cell this far right
+            column.add_nulls(self._profiled_rows)
+            self.columns.append(column)
+        
+        padded = [row + (None,) * (width - len(row)) for row in self._chunk]
+        frame = pd.DataFrame(padded, columns=range(width))
+        for i, column in enumerate(self.columns):
+            if i < width:
+                column.add_series(frame[i])
+            else:
+                column.add_nulls(len(self._chunk))
+        
+        self._profiled_rows += len(self._chunk)
+        self._chunk = []
+        if self.on_chunk is not None:
+            self.on_chunk(frame)
+    
+    def finish(self, names: List[str]) -> List[ColumnProfile]:
+        """Flush the last chunk and label the columns"""
+        self._flush()
+        while len(self.columns) < len(names):
+            column = ColumnProfile("")
+            column.add_nulls(self.rows)
+            self.columns.append(column)
+        for column, name in zip(self.columns, names):
+            column.name = name
+        return self.columns
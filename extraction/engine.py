@@ -0,0 +1,160 @@
+"""
+Extraction engine
+=================
+Single code path behind every extract_*.py entry point: resolves the
+extractor for a file and routes its sections through the cache and the
+streaming writer. Batches of files are scheduled by extraction.batch.
+"""
+
+import json
+import os
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Optional
+
+from .cache import file_digest
+from .metrics import Stopwatch
+from .options import ExtractionOptions
+from .registry import Extractor, detect, get_extractor
+from .stream import ExtractionOutput, Section, stream_document, write_stream
+from .structured import StructuredWriter
+
+
+@dataclass
+class ExtractionJob:
+    """One input file and where its Markdown goes"""
+    path: str
+    output_path: Optional[str] = None
+    extractor: Optional[str] = None
+    title: Optional[str] = None
+    digest: Optional[str] = None
+
+
+def resolve_extractor(path, name: Optional[str] = None) -> Extractor:
+    """Return the named extractor, or detect one from the file contents"""
+    if name:
+        return get_extractor(name)
+    extractor = detect(path)
+    if extractor is None:
+        raise ValueError(f"Unsupported file type: {path}")
+    return extractor
+
+
+def profile_path(output_path) -> Path:
+    """Sidecar path for the structured column profile of an output file"""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.profile.json")
+
+
+def write_profiles(output_path, source_name: str, profiles):
+    """Write per-sheet column profiles next to the Markdown output"""
+    with open(profile_path(output_path), 'w', encoding='utf-8') as f:
+        json.dump({"source": source_name, "sheets": profiles}, f, indent=2, default=str)
+
+
+def _tee_records(sections, records: StructuredWriter):
+    """Pass sections through, recording each page or slide as it goes by"""
+    for section in sections:
+        if isinstance(section, Section) and section.text is not None:
+            records.write_section(section)
+        yield section
+
+
+def _timed_sections(sections, units):
+    """
+    Pass sections through, appending a timing event per Section to units.
+    Sections that carry their own metrics (measured in a worker) keep them;
+    otherwise the time taken to produce the section here is recorded.
+    """
+    iterator = iter(sections)
+    while True:
+        watch = Stopwatch()
+        try:
+            section = next(iterator)
+        except StopIteration:
+            return
+        if isinstance(section, Section):
+            metrics = section.metrics
+            if metrics is None:
+                text = section.text if section.text is not None else section.markdown
+                metrics = watch.stop(text_bytes=len(text.encode('utf-8')))
+            units.append({"kind": section.kind, "number": section.number, **metrics})
+        yield section
+
+
+def extract_file(path, output_path=None, extractor: Optional[str] = None,
+                 title: Optional[str] = None, options: Optional[ExtractionOptions] = None,
+                 return_content: bool = False, digest: Optional[str] = None) -> ExtractionOutput:
+    """
+    Extract one file to Markdown
+    
+    Errors are reported on the returned ExtractionOutput rather than raised,
+    so a batch keeps going past a bad file. A precomputed content digest
+    can be passed to skip re-hashing the file.
+    
+    With options.jsonl / options.parquet the structured outputs are written
+    next to output_path in the same pass. Those runs skip the whole-document
+    cache, since a cached replay has no records to emit; PDF pages still
+    come from the page cache. The same applies when options.pages selects
+    part of a PDF, since the document cache holds whole files.
+    """
+    options = options or ExtractionOptions()
+    records = None
+    watch = Stopwatch()
+    
+    try:
+        spec = resolve_extractor(path, extractor)
+        print(f"Extracting {spec.label} content from: {path}")
+        
+        header = [
+            f"# {title or spec.default_title(path)}",
+            "=" * 50,
+            ""
+        ]
+        if options.structured and output_path:
+            records = StructuredWriter(output_path, Path(path).name,
+                                       jsonl=options.jsonl, parquet=options.parquet)
+            options = replace(options, records=records)
+            digest = None
+        elif options.pages:
+            digest = None
+        elif options.cache_enabled and digest is None:
+            digest = file_digest(path)
+        elif not options.cache_enabled:
+            digest = None
+        
+        stats = {}
+        units = []
+        sections = _timed_sections(spec.load()(str(path), options), units)
+        if records is not None:
+            sections = _tee_records(sections, records)
+        chunks = stream_document(header, sections, options.cache, spec.name, digest, stats)
+        result = write_stream(chunks, output_path, return_content)
+        
+        if records is not None:
+            records.close(success=True)
+            records = None
+        result.units = stats.get("units")
+        result.failed_units = stats.get("failed_units", 0)
+        result.bytes_read = os.path.getsize(path)
+        result.section_data = stats.get("data", [])
+        if output_path:
+            text_bytes = os.path.getsize(output_path)
+        else:
+            text_bytes = len(result.content.encode('utf-8'))
+        result.metrics = watch.stop(extractor=spec.name, bytes_read=result.bytes_read,
+                                    text_bytes=text_bytes, cached=stats.get("cached", False),
+                                    units=units)
+        
+        profiles = [item["profile"] for item in result.section_data if "profile" in item]
+        if profiles and output_path:
+            write_profiles(output_path, Path(path).name, profiles)
+        return result
+        
+    except Exception as e:
+        if records is not None:
+            records.close(success=False)
+        error_msg = f"Error extracting content from {Path(path).name}: {str(e)}"
+        print(error_msg)
+        return ExtractionOutput(output_path=str(output_path) if output_path else None,
+                                error=error_msg)
@@ -0,0 +1,204 @@
+"""
+Excel extractor
+Renders each sheet's dimensions, columns, sample rows and low-cardinality
+column values, and attaches a structured column profile to each sheet.
+
+The workbook is opened once in openpyxl's read-only mode and each sheet's
+rows are streamed; only the sample rows, the chunk of rows currently
+being profiled and bounded per-column counts are kept in memory, so
+extraction time is linear in the workbook size rather than sheets ×
+workbook size.
+"""
+
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+import pandas as pd
+
+from .column_profile import CARDINALITY_LIMIT, TableProfiler
+from .options import ExtractionOptions
+from .stream import Section
+
+SAMPLE_ROWS = 10
+
+# Text columns with fewer distinct values than this get a value summary
+UNIQUE_VALUE_LIMIT = CARDINALITY_LIMIT
+
+
+def _column_names(header, width):
+    """Column labels as pandas would assign them: blanks become "Unnamed: i", repeats get a suffix"""
+    names = []
+    seen = {}
+    for i in range(width):
+        value = header[i] if i < len(header) else None
+        name = f"Unnamed: {i}" if value is None or value == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _clean(row):
+    """
+    Blank out cached formula errors (as pandas does) and drop trailing
+    empty cells from a row of values
+    """
+    if any(value in ERROR_CODES for value in row if isinstance(value, str)):
+        row = tuple(None if isinstance(value, str) and value in ERROR_CODES else value
+                    for value in row)
+    end = len(row)
+    while end and (row[end - 1] is None or row[end - 1] == ""):
+        end -= 1
+    return row[:end]
+
+
+class _SheetScan:
+    """
+    Single pass over a sheet's data rows feeding the sample, the column
+    profiler and, when requested, the JSONL and Parquet outputs
+    """
+    
+    def __init__(self, sheet_name, header, records=None, parquet=None):
+        self.sheet_name = sheet_name
+        self.header = header
+        self.sample = []
+        self.profiler = TableProfiler(on_chunk=self._write_chunk if parquet else None)
+        self._records = records if records is not None and records.wants_rows else None
+        self._parquet = parquet
+        self._columns = _column_names(header, len(header))
+        self._pending_blank = 0
+    
+    def _names(self, width):
+        if width > len(self._columns):
+            self._columns = _column_names(self.header, width)
+        return self._columns
+    
+    def _write_chunk(self, frame):
+        self._parquet.write_chunk(frame, self._names(frame.shape[1]))
+    
+    @property
+    def rows(self):
+        return self.profiler.rows
+    
+    def add(self, row):
+        row = _clean(row)
+        if not row:
+            # Trailing blank rows are dropped, so only count blanks once a
+            # non-blank row follows them
+            self._pending_blank += 1
+            return
+        for _ in range(self._pending_blank):
+            self._add_row(())
+        self._pending_blank = 0
+        self._add_row(row)
+    
+    def _add_row(self, row):
+        if len(self.sample) < SAMPLE_ROWS:
+            self.sample.append(row)
+        self.profiler.add_row(row)
+        if self._records is not None:
+            self._records.write_row(self.sheet_name, self.profiler.rows, self._names(len(row)), row)
+
+
+def _sample_frame(sample, columns, profiles):
+    """
+    Build the sample rows as a DataFrame typed by the whole-sheet column
+    dtypes, so values render as they would from a full read of the sheet
+    """
+    rows = [list(row) + [None] * (len(columns) - len(row)) for row in sample]
+    df = pd.DataFrame(rows, columns=range(len(columns)), dtype=object)
+    for i, profile in enumerate(profiles):
+        if profile.dtype == "float64":
+            df[i] = df[i].astype("float64")
+        elif profile.dtype and profile.dtype.startswith("datetime64"):
+            # Date-only columns then print as 2024-01-15, not with 00:00:00
+            df[i] = pd.to_datetime(df[i])
+    df.columns = columns
+    return df
+
+
+def _iter_sheet_lines(worksheet, sheet_name, profile_data, records=None, parquet=None):
+    """
+    Yield the Markdown lines for one sheet from a single pass over its rows,
+    filling profile_data with the sheet's column profile
+    """
+    yield f"## Sheet: {sheet_name}"
+    yield "-" * 30
+    
+    try:
+        # Read-only sheets trust the stored dimensions, which some writers
+        # get wrong; resetting makes iter_rows read every row present.
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+        header = _clean(next(rows, ()))
+        
+        scan = _SheetScan(sheet_name, header, records, parquet)
+        for row in rows:
+            scan.add(row)
+        
+        columns = _column_names(header, max(len(header), scan.profiler.width))
+        profiles = scan.profiler.finish(columns)
+        profile_data["rows"] = scan.rows
+        profile_data["columns"] = [profile.to_dict() for profile in profiles]
+        
+        # Basic info about the sheet
+        yield f"**Dimensions**: {scan.rows} rows × {len(columns)} columns"
+        yield ""
+        
+        # Column headers
+        if scan.rows and columns:
+            yield "**Columns**:"
+            for col in columns:
+                yield f"- {col}"
+            yield ""
+            
+            # First few rows of data (non-empty)
+            yield "**Sample Data**:"
+            # Convert to string and handle empty cells
+            df_string = _sample_frame(scan.sample, columns, profiles).fillna("").astype(str)
+            yield df_string.to_string(index=False)
+            yield ""
+            
+            # If there are many rows, show summary stats
+            if scan.rows > SAMPLE_ROWS:
+                yield f"**Total Records**: {scan.rows} (showing first {SAMPLE_ROWS})"
+                yield ""
+                
+                # Show unique values in low-cardinality text columns
+                for profile in profiles:
+                    cardinality = profile.cardinality
+                    if profile.is_text and cardinality is not None and cardinality < UNIQUE_VALUE_LIMIT:
+                        unique_vals = [str(val) for val in profile.distinct_values() if str(val) != '']
+                        if unique_vals:
+                            yield f"**{profile.name} - Unique Values**: {', '.join(unique_vals[:10])}"
+        
+        else:
+            yield "*Sheet is empty*"
+        
+    except Exception as e:
+        yield f"Error reading sheet {sheet_name}: {str(e)}"
+    
+    yield ""
+
+
+def iter_excel_sections(excel_path, options: ExtractionOptions):
+    """Yield the Markdown body of an Excel workbook one sheet at a time"""
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    
+    try:
+        yield f"**Total Sheets**: {len(workbook.sheetnames)}"
+        yield ""
+        
+        for number, sheet_name in enumerate(workbook.sheetnames, 1):
+            profile_data = {"sheet": sheet_name}
+            records = options.records
+            parquet = records.sheet_parquet(sheet_name, number) if records is not None else None
+            lines = _iter_sheet_lines(workbook[sheet_name], sheet_name, profile_data, records, parquet)
+            markdown = "\n".join(lines)
+            if parquet is not None and parquet.coerced:
+                profile_data["parquet_coerced_values"] = parquet.coerced
+            yield Section("sheet", number, markdown, data={"profile": profile_data})
+    finally:
+        workbook.close()
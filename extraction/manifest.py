@@ -0,0 +1,172 @@
+"""
+Extraction manifest
+===================
+Remembers what each output was built from (input path, size, mtime,
+SHA-256, extractor and version, and every file written for it), so a
+repeat run can tell in one stat() call per input which files are
+untouched, re-extract only the changed ones, and delete outputs whose
+inputs have disappeared.
+
+An input whose size and mtime match its entry is skipped without being
+read. If only the mtime moved (a copy or touch), the file is re-hashed
+and skipped when the content is unchanged.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .cache import DEFAULT_CACHE_DIR, EXTRACTOR_VERSION, file_digest
+from .engine import ExtractionJob, profile_path
+from .options import ExtractionOptions
+from .stream import PREVIEW_CHARS, ExtractionOutput
+from .structured import jsonl_path, parquet_dir
+
+DEFAULT_MANIFEST_PATH = DEFAULT_CACHE_DIR / "manifest.json"
+
+_MANIFEST_FORMAT = 1
+
+
+def _formats(options: ExtractionOptions) -> List[str]:
+    formats = ["md"]
+    if options.jsonl:
+        formats.append("jsonl")
+    if options.parquet:
+        formats.append("parquet")
+    return formats
+
+
+def _companion_outputs(output_path) -> List[str]:
+    """Structured outputs written next to output_path that currently exist"""
+    candidates = [jsonl_path(output_path), parquet_dir(output_path), profile_path(output_path)]
+    return [str(path) for path in candidates if path.exists()]
+
+
+def _remove_output(path: str):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class Manifest:
+    """JSON manifest of extracted outputs, keyed by output path"""
+    
+    def __init__(self, path=None, force: bool = False):
+        self.path = Path(path) if path else DEFAULT_MANIFEST_PATH
+        # force: treat every output as stale, but still record the new ones
+        self.force = force
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("format") == _MANIFEST_FORMAT:
+                self.entries = data.get("entries", {})
+        except (FileNotFoundError, ValueError):
+            pass
+    
+    @staticmethod
+    def _key(output_path) -> str:
+        return str(Path(output_path).resolve())
+    
+    def is_current(self, job: ExtractionJob, options: Optional[ExtractionOptions] = None) -> bool:
+        """True if job's output was built from the input as it is now, with the same settings"""
+        options = options or ExtractionOptions()
+        if self.force or not job.output_path:
+            return False
+        entry = self.entries.get(self._key(job.output_path))
+        if not entry:
+            return False
+        
+        try:
+            stat = os.stat(job.path)
+        except FileNotFoundError:
+            return False
+        
+        if (entry["input"] != str(Path(job.path).resolve())
+                or entry["version"] != EXTRACTOR_VERSION
+                or entry["extractor"] != job.extractor
+                or entry.get("title") != job.title
+                or entry.get("pages") != (list(options.pages) if options.pages else None)
+                or not set(_formats(options)) <= set(entry["formats"])
+                or not all(os.path.exists(path) for path in entry["outputs"])):
+            return False
+        
+        if entry["size"] != stat.st_size:
+            return False
+        if entry["mtime_ns"] != stat.st_mtime_ns:
+            if file_digest(job.path) != entry["sha256"]:
+                return False
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.dirty = True
+        return True
+    
+    def skipped_output(self, job: ExtractionJob) -> ExtractionOutput:
+        """Output summary for a job whose existing output is reused"""
+        entry = self.entries[self._key(job.output_path)]
+        with open(job.output_path, 'r', encoding='utf-8') as f:
+            preview = f.read(PREVIEW_CHARS)
+        return ExtractionOutput(output_path=job.output_path, chars_written=entry["chars"],
+                                preview=preview, skipped=True)
+    
+    def record(self, job: ExtractionJob, result: ExtractionOutput,
+               options: Optional[ExtractionOptions] = None):
+        """Remember a successful extraction"""
+        options = options or ExtractionOptions()
+        # Outputs with placeholder pages are retried on the next run
+        if result.error or result.skipped or result.failed_units or not job.output_path:
+            return
+        stat = os.stat(job.path)
+        self.entries[self._key(job.output_path)] = {
+            "input": str(Path(job.path).resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": job.digest or file_digest(job.path),
+            "extractor": job.extractor,
+            "title": job.title,
+            "version": EXTRACTOR_VERSION,
+            "formats": _formats(options),
+            "pages": list(options.pages) if options.pages else None,
+            "chars": result.chars_written,
+            "outputs": [self._key(job.output_path)] + _companion_outputs(job.output_path),
+        }
+        self.dirty = True
+    
+    def collect_garbage(self, root) -> List[str]:
+        """
+        Delete outputs whose inputs under root no longer exist, and forget
+        them. Returns the removed output paths.
+        """
+        root = str(Path(root).resolve()).rstrip(os.sep) + os.sep
+        removed = []
+        for key, entry in list(self.entries.items()):
+            if not entry["input"].startswith(root) or os.path.exists(entry["input"]):
+                continue
+            for path in entry["outputs"]:
+                _remove_output(path)
+                removed.append(path)
+            del self.entries[key]
+            self.dirty = True
+        return removed
+    
+    def save(self):
+        """Atomically write the manifest if anything changed"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".manifest-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"format": _MANIFEST_FORMAT, "entries": self.entries}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.dirty = False
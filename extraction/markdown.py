@@ -0,0 +1,18 @@
+"""
+Markdown rendering helpers shared by the extractors
+"""
+
+from typing import List
+
+
+def markdown_table(rows: List[List[str]]) -> List[str]:
+    """Lines of a Markdown table; the first row is the header"""
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    
+    def format_row(row):
+        cells = (" ".join(cell.split()).replace("|", "\\|") for cell in row)
+        return "| " + " | ".join(cells) + " |"
+    
+    return [format_row(rows[0]), "| " + " | ".join("---" for _ in range(width)) + " |"] + \
+        [format_row(row) for row in rows[1:]]
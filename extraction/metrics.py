@@ -0,0 +1,125 @@
+"""
+Extraction instrumentation
+==========================
+Wall time, CPU time and peak RSS for every file and every page, slide or
+sheet, collected as plain dicts on ExtractionOutput.metrics and written
+out as a JSON report. Optional cProfile capture for the whole run.
+
+Page timings for PDFs sharded across a process pool are measured inside
+the worker, so they reflect the page's own cost rather than time spent
+waiting on the pool. Peak RSS is the high-water mark of the measuring
+process at the end of the unit.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+SLOWEST_UNITS = 5
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, in bytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Stopwatch:
+    """Wall and CPU time since construction"""
+    
+    def __init__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+    
+    def stop(self, **fields) -> Dict:
+        return {
+            "wall_s": round(time.perf_counter() - self.wall_start, 6),
+            "cpu_s": round(time.process_time() - self.cpu_start, 6),
+            "peak_rss_bytes": peak_rss_bytes(),
+            **fields,
+        }
+
+
+def slowest_units(results, limit: int = SLOWEST_UNITS) -> List[Dict]:
+    """The slowest pages/slides/sheets across a batch, slowest first"""
+    units = []
+    for job, result in results:
+        for unit in (result.metrics or {}).get("units", []):
+            units.append({"path": job.path, **unit})
+    return sorted(units, key=lambda unit: unit["wall_s"], reverse=True)[:limit]
+
+
+def metrics_report(results, report=None) -> Dict:
+    """JSON-ready report of a batch: totals plus per-file and per-unit events"""
+    files = []
+    for job, result in results:
+        entry = {"path": job.path, "output_path": job.output_path, "error": result.error,
+                 "skipped": result.skipped}
+        entry.update(result.metrics or {})
+        files.append(entry)
+    
+    data = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "files": files,
+    }
+    if report is not None:
+        data["batch"] = {
+            "files": report.files,
+            "failed": report.failed,
+            "skipped": report.skipped,
+            "units": report.units,
+            "bytes_read": report.bytes_read,
+            "wall_s": round(report.elapsed, 6),
+        }
+    return data
+
+
+def write_metrics_report(path, results, report=None):
+    """Write metrics_report() as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(metrics_report(results, report), f, indent=2)
+
+
+def run_profiled(func: Callable, profile_path=None, top: int = 20):
+    """
+    Call func(), under cProfile when profile_path is given: the raw stats
+    are dumped there (load with pstats) and the top entries by cumulative
+    time are printed.
+    """
+    if not profile_path:
+        return func()
+    
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        profiler.dump_stats(str(profile_path))
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(top)
+        print(summary.getvalue())
+        print(f"📈 Profile written to: {profile_path}")
+
+
+def add_instrumentation_args(parser):
+    """--metrics / --profile options shared by the extract_*.py scripts"""
+    parser.add_argument(
+        "--metrics", metavar="PATH",
+        help="Write per-file and per-page timing and memory metrics as JSON"
+    )
+    parser.add_argument(
+        "--profile", metavar="PATH",
+        help="Run under cProfile and write pstats data to PATH"
+    )
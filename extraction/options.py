@@ -0,0 +1,49 @@
+"""
+Extraction options shared by every extractor
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from .cache import ExtractionCache
+
+
+@dataclass
+class ExtractionOptions:
+    """Per-run settings passed through the engine to each extractor"""
+    workers: int = 1
+    cache: Optional[ExtractionCache] = None
+    jsonl: bool = False
+    parquet: bool = False
+    # Per-file StructuredWriter, set by the engine when jsonl/parquet is on
+    records: Optional[Any] = None
+    # 1-based inclusive page range for PDFs; last is None for "to the end"
+    pages: Optional[Tuple[int, Optional[int]]] = None
+    # Per-page budgets; when either is set pages run in supervised workers
+    page_timeout: Optional[float] = None
+    page_memory_mb: Optional[int] = None
+    
+    @property
+    def cache_enabled(self) -> bool:
+        return self.cache is not None and self.cache.enabled
+    
+    @property
+    def structured(self) -> bool:
+        return self.jsonl or self.parquet
+    
+    @property
+    def supervised(self) -> bool:
+        return self.page_timeout is not None or self.page_memory_mb is not None
+
+
+def parse_page_range(spec: str) -> Tuple[int, Optional[int]]:
+    """Parse "10-40", "10-" or "7" into a 1-based inclusive (first, last) range"""
+    first, sep, last = spec.partition("-")
+    try:
+        first_page = int(first) if first.strip() else 1
+        last_page = (int(last) if last.strip() else None) if sep else first_page
+    except ValueError:
+        raise ValueError(f"Invalid page range: {spec!r}") from None
+    if first_page < 1 or (last_page is not None and last_page < first_page):
+        raise ValueError(f"Invalid page range: {spec!r}")
+    return first_page, last_page
@@ -0,0 +1,139 @@
+"""
+PDF extractor
+Renders each page's text as a "## Page N" section, optionally sharding
+page ranges across a process pool, or running pages in supervised
+workers with time and memory budgets. Files are memory-mapped and pages
+resolved lazily (see pdf_pages), so options.pages can pull a few pages
+out of a very large file without reading the rest.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .cache import ExtractionCache
+from .metrics import Stopwatch
+from .options import ExtractionOptions
+from .pdf_pages import LazyPdf
+from .stream import Section
+from .supervisor import iter_supervised
+
+
+def _page_section(pdf: LazyPdf, page_num: int, cache: ExtractionCache) -> Section:
+    """The Markdown section for one zero-based page of an open PDF"""
+    watch = Stopwatch()
+    section = [f"## Page {page_num + 1}", "-" * 20]
+    text = ""
+    
+    try:
+        page = pdf.page(page_num)
+        text = cache.page_text("pdf", page)
+        
+        if text.strip():
+            section.append(text.strip())
+        else:
+            section.append("(No extractable text content)")
+            
+    except MemoryError:
+        # Left to the supervisor, which records the page as over budget
+        raise
+    except Exception as e:
+        section.append(f"Error extracting page {page_num + 1}: {str(e)}")
+    
+    section.append("")
+    pdf.release()
+    text = text.strip()
+    return Section("page", page_num + 1, "\n".join(section), text=text,
+                   metrics=watch.stop(text_bytes=len(text.encode('utf-8'))))
+
+
+def _iter_page_range(pdf_path, start, end, cache=None, render=_page_section):
+    """
+    Yield the Markdown sections for pages [start, end) of a PDF.
+    Each call reopens the file so it can run in a separate worker process.
+    """
+    cache = cache or ExtractionCache(enabled=False)
+    
+    with LazyPdf(pdf_path) as pdf:
+        for page_num in range(start, end):
+            yield render(pdf, page_num, cache)
+
+
+def _extract_page_range(pdf_path, start, end, cache=None, render=_page_section):
+    """Process-pool entry point: the sections for one shard of pages"""
+    return list(_iter_page_range(pdf_path, start, end, cache, render))
+
+
+def _page_ranges(first, end, workers):
+    """
+    Split pages [first, end) into contiguous shards, a few per worker so a
+    slow shard does not leave the other workers idle at the end.
+    """
+    page_count = end - first
+    shard_count = min(page_count, workers * 4)
+    shard_size = -(-page_count // shard_count)
+    return [(start, min(start + shard_size, end))
+            for start in range(first, end, shard_size)]
+
+
+def iter_pdf_pages(pdf_path, options: ExtractionOptions, render=_page_section):
+    """
+    Yield the Markdown body of a PDF one page section at a time, each page
+    rendered by render(pdf, page_num, cache), a module-level function so
+    it can run in worker processes
+    
+    With workers > 1 the shards run in a process pool; at most two shards
+    per worker are in flight so finished pages are written out rather
+    than piling up in memory.
+    
+    options.pages limits the output to a 1-based inclusive page range.
+    With options.page_timeout / page_memory_mb each page runs in a
+    supervised worker and pages that exceed a budget become placeholders.
+    """
+    workers = options.workers
+    cache = options.cache
+    
+    with LazyPdf(pdf_path) as pdf:
+        total_pages = len(pdf)
+    
+    first, end = 0, total_pages
+    if options.pages:
+        first = min(options.pages[0] - 1, total_pages)
+        end = min(options.pages[1] or total_pages, total_pages)
+    
+    yield f"**Total Pages**: {total_pages}"
+    if options.pages:
+        yield f"**Pages Extracted**: {first + 1}-{end}" if end > first else "**Pages Extracted**: none"
+    yield ""
+    
+    if options.supervised:
+        memory_budget = options.page_memory_mb * 1024 * 1024 if options.page_memory_mb else None
+        yield from iter_supervised(pdf_path, range(first, end), LazyPdf, render, "page",
+                                   workers=workers, cache=cache or ExtractionCache(enabled=False),
+                                   timeout=options.page_timeout, memory_budget=memory_budget)
+        return
+    
+    if workers <= 1 or end - first <= 1:
+        yield from _iter_page_range(pdf_path, first, end, cache, render)
+        return
+    
+    ranges = iter(_page_ranges(first, end, workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk_start, chunk_end in ranges:
+            in_flight.append(executor.submit(_extract_page_range, pdf_path, chunk_start, chunk_end,
+                                             cache, render))
+            if len(in_flight) >= workers * 2:
+                break
+        
+        # Futures are consumed in submission order, so pages stay in order
+        while in_flight:
+            sections = in_flight.popleft().result()
+            next_range = next(ranges, None)
+            if next_range is not None:
+                in_flight.append(executor.submit(_extract_page_range, pdf_path, *next_range, cache, render))
+            yield from sections
+
+
+def iter_pdf_sections(pdf_path, options: ExtractionOptions):
+    """Yield the Markdown body of a PDF, one page of plain extracted text at a time"""
+    return iter_pdf_pages(pdf_path, options)
@@ -0,0 +1,284 @@
+"""
+Layout-aware PDF extractor
+==========================
+Alternative to the plain "pdf" extractor for documents with tables. Each
+page is reduced to positioned text blocks (start x/y and font size, taken
+from PyPDF2's text visitors), which are grouped into lines and cells by
+position; runs of lines whose cells share column positions become
+Markdown tables.
+
+The blocks are cached per page in a compact binary form (zlib-compressed
+fixed-width records) under the page text cache's key. That key covers
+the content streams, every resource they draw on (fonts, Form XObjects)
+and the page geometry (/MediaBox, /CropBox, /Rotate), so pages that only
+share a content stream never share blocks. Re-rendering a page as
+Markdown or JSON only decodes the blocks and redoes the cheap grouping,
+without interpreting the content stream again.
+"""
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from .cache import ExtractionCache
+from .markdown import markdown_table
+from .metrics import Stopwatch
+from .options import ExtractionOptions
+from .pdf_extractor import iter_pdf_pages
+from .pdf_pages import LazyPdf
+from .stream import Section
+
+# Bump when the block encoding or what is captured changes
+LAYOUT_FORMAT = 1
+
+# Page cache key; includes the format so stale blobs are never decoded
+_CACHE_KEY = f"pdf-layout-f{LAYOUT_FORMAT}"
+
+_MAGIC = b"P3LB"
+_HEADER = struct.Struct("<4sBI")      # magic, format, block count
+_BLOCK = struct.Struct("<fffI")       # x, y, font size, UTF-8 length
+
+_TEXT_OPERATORS = (b"Tj", b"TJ", b"'", b'"')
+
+# Rough glyph width as a fraction of the font size, for estimating where
+# a block ends
+_CHAR_WIDTH = 0.5
+# Horizontal gap (in font sizes) that separates two cells on a line
+_CELL_GAP = 2.0
+# Gap (in font sizes) above which a space is inserted between blocks. Word
+# spaces are normally explicit in the text; glyph width estimates are too
+# rough to find them from small gaps.
+_WORD_GAP = 1.0
+# Distance (in points) within which cell starts count as the same column
+_COLUMN_TOLERANCE = 8.0
+
+
+@dataclass
+class TextBlock:
+    """A run of text and where it starts on the page"""
+    x: float
+    y: float
+    size: float
+    text: str
+    
+    @property
+    def end(self) -> float:
+        return self.x + len(self.text) * self.size * _CHAR_WIDTH
+
+
+def _mult(m, n):
+    return [
+        m[0] * n[0] + m[1] * n[2],
+        m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2],
+        m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4],
+        m[4] * n[1] + m[5] * n[3] + n[5],
+    ]
+
+
+def extract_blocks(page) -> List[TextBlock]:
+    """Positioned text blocks of a PyPDF2 page"""
+    blocks = []
+    start = None
+    
+    # PyPDF2 reports text when it flushes, by which point the text matrix
+    # has advanced; the position is taken before the first show-text
+    # operator since the previous flush instead.
+    def before(operator, operands, cm, tm):
+        nonlocal start
+        if operator in _TEXT_OPERATORS and start is None:
+            start = _mult(tm, cm)
+    
+    def visit(text, cm, tm, font, font_size):
+        nonlocal start
+        text = text.replace("\n", "")
+        if text:
+            matrix = start or _mult(tm, cm)
+            size = font_size * (abs(matrix[3]) or 1.0)
+            blocks.append(TextBlock(matrix[4], matrix[5], size, text))
+            start = None
+    
+    page.extract_text(visitor_operand_before=before, visitor_text=visit)
+    return blocks
+
+
+def encode_blocks(blocks: List[TextBlock]) -> bytes:
+    parts = [_HEADER.pack(_MAGIC, LAYOUT_FORMAT, len(blocks))]
+    for block in blocks:
+        text = block.text.encode('utf-8')
+        parts.append(_BLOCK.pack(block.x, block.y, block.size, len(text)))
+        parts.append(text)
+    return zlib.compress(b"".join(parts))
+
+
+def decode_blocks(data: bytes) -> List[TextBlock]:
+    data = zlib.decompress(data)
+    magic, version, count = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != LAYOUT_FORMAT:
+        raise ValueError("Unrecognised layout block data")
+    offset = _HEADER.size
+    blocks = []
+    for _ in range(count):
+        x, y, size, length = _BLOCK.unpack_from(data, offset)
+        offset += _BLOCK.size
+        blocks.append(TextBlock(x, y, size, data[offset:offset + length].decode('utf-8')))
+        offset += length
+    return blocks
+
+
+def _group_lines(blocks: List[TextBlock]) -> List[List[TextBlock]]:
+    """Blocks grouped into lines, top to bottom, each sorted left to right"""
+    lines = []
+    for block in sorted(blocks, key=lambda b: (-b.y, b.x)):
+        if lines and abs(lines[-1][0].y - block.y) <= max(block.size, lines[-1][0].size) * 0.5:
+            lines[-1].append(block)
+        else:
+            lines.append([block])
+    return [sorted(line, key=lambda b: b.x) for line in lines]
+
+
+def _split_cells(line: List[TextBlock]) -> List[Tuple[float, str]]:
+    """(start x, text) of each cell on a line, split at wide horizontal gaps"""
+    cells = []
+    x, parts, previous = None, [], None
+    for block in line:
+        if previous is not None:
+            gap = block.x - previous.end
+            if gap > block.size * _CELL_GAP:
+                cells.append((x, "".join(parts)))
+                x, parts = None, []
+            elif (gap > block.size * _WORD_GAP and parts
+                  and not parts[-1].endswith(" ") and not block.text.startswith(" ")):
+                parts.append(" ")
+        if x is None:
+            x = block.x
+        parts.append(block.text)
+        previous = block
+    if parts:
+        cells.append((x, "".join(parts)))
+    return [(x, " ".join(text.split())) for x, text in cells if text.strip()]
+
+
+def _column(anchors: List[float], x: float) -> int:
+    """Index of the column anchor x belongs to, or -1"""
+    for i, anchor in enumerate(anchors):
+        if abs(anchor - x) <= _COLUMN_TOLERANCE:
+            return i
+    return -1
+
+
+def _aligned(anchors: List[float], cells) -> bool:
+    return sum(1 for x, _ in cells if _column(anchors, x) >= 0) >= 2
+
+
+def layout_segments(blocks: List[TextBlock]):
+    """
+    The page as a list of ("text", line) and ("table", rows) segments.
+    A table is two or more consecutive multi-cell lines sharing at least
+    two column positions; a single-cell line that starts in a table's
+    second or later column continues the cell above it.
+    """
+    segments = []
+    table = None
+    
+    def close_table():
+        nonlocal table
+        if table is None:
+            return
+        anchors, rows = table
+        if len(rows) >= 2:
+            segments.append(("table", [[" ".join(cell) for cell in row] for row in rows]))
+        else:
+            for row in rows:
+                segments.append(("text", "  ".join(" ".join(cell) for cell in row if cell)))
+        table = None
+    
+    def add_row(anchors, rows, cells):
+        row = [[] for _ in anchors]
+        for x, text in cells:
+            column = _column(anchors, x)
+            if column < 0:
+                anchors.append(x)
+                for existing in rows:
+                    existing.append([])
+                row.append([])
+                column = len(anchors) - 1
+            row[column].append(text)
+        rows.append(row)
+    
+    for line in _group_lines(blocks):
+        cells = _split_cells(line)
+        if not cells:
+            continue
+        
+        if table is not None:
+            anchors, rows = table
+            if len(cells) >= 2 and _aligned(anchors, cells):
+                add_row(anchors, rows, cells)
+                continue
+            if len(cells) == 1 and _column(anchors, cells[0][0]) > 0:
+                rows[-1][_column(anchors, cells[0][0])].append(cells[0][1])
+                continue
+            close_table()
+        
+        if len(cells) >= 2:
+            table = ([x for x, _ in cells], [])
+            add_row(table[0], table[1], cells)
+        else:
+            segments.append(("text", cells[0][1]))
+    
+    close_table()
+    return segments
+
+
+def render_blocks(blocks: List[TextBlock]) -> Tuple[str, str, List[List[List[str]]]]:
+    """Markdown body, plain text and tables (lists of rows) for a page's blocks"""
+    markdown, text, tables = [], [], []
+    for kind, content in layout_segments(blocks):
+        if kind == "table":
+            if markdown and markdown[-1] != "":
+                markdown.append("")
+            markdown.extend(markdown_table(content))
+            markdown.append("")
+            text.extend("\t".join(row) for row in content)
+            tables.append(content)
+        else:
+            markdown.append(content)
+            text.append(content)
+    while markdown and markdown[-1] == "":
+        markdown.pop()
+    return "\n".join(markdown), "\n".join(text), tables
+
+
+def _page_blocks(page) -> bytes:
+    return encode_blocks(extract_blocks(page))
+
+
+def layout_page_section(pdf: LazyPdf, page_num: int, cache: ExtractionCache) -> Section:
+    """The layout-aware Markdown section for one zero-based page of an open PDF"""
+    watch = Stopwatch()
+    section = [f"## Page {page_num + 1}", "-" * 20]
+    text, tables = "", []
+    
+    try:
+        page = pdf.page(page_num)
+        blocks = decode_blocks(cache.page_blob(_CACHE_KEY, page, _page_blocks))
+        markdown, text, tables = render_blocks(blocks)
+        section.append(markdown or "(No extractable text content)")
+    except MemoryError:
+        raise
+    except Exception as e:
+        section.append(f"Error extracting page {page_num + 1}: {str(e)}")
+    
+    section.append("")
+    pdf.release()
+    return Section("page", page_num + 1, "\n".join(section), text=text,
+                   data={"tables": tables} if tables else None,
+                   metrics=watch.stop(text_bytes=len(text.encode('utf-8'))))
+
+
+def iter_layout_sections(pdf_path, options: ExtractionOptions):
+    """Yield the layout-aware Markdown body of a PDF one page at a time"""
+    return iter_pdf_pages(pdf_path, options, layout_page_section)
@@ -0,0 +1,107 @@
+"""
+Lazy PDF page access
+====================
+PyPDF2 resolves the entire page tree the first time a page or the page
+count is requested. LazyPdf memory-maps the file, reads the page count
+from the root /Count, and finds page N by descending only the branch of
+the page tree that contains it (skipping sibling subtrees by their
+/Count). Pulling the first pages of a very large file therefore touches
+only the objects those pages need.
+
+Between pages release() drops PyPDF2's resolved-object cache so memory
+does not grow with the number of pages read.
+"""
+
+import mmap
+
+import PyPDF2
+from PyPDF2 import PageObject
+from PyPDF2.generic import IndirectObject, NameObject
+
+# Attributes a page inherits from its ancestors in the page tree
+_INHERITABLE = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+class LazyPdf:
+    """Memory-mapped PyPDF2 reader with on-demand page lookup"""
+    
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped; let PdfReader report the error
+            self._map = None
+        self.reader = PyPDF2.PdfReader(self._map if self._map is not None else self._file)
+        self._tree = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.reader = None
+        self._tree = None
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+    
+    def _page_tree(self):
+        if self._tree is None:
+            self._tree = self.reader.trailer["/Root"].get_object()["/Pages"].get_object()
+        return self._tree
+    
+    def __len__(self) -> int:
+        try:
+            return int(self._page_tree()["/Count"])
+        except (KeyError, TypeError, ValueError):
+            return len(self.reader.pages)
+    
+    def page(self, index: int) -> PageObject:
+        """Page at zero-based index, resolving only its path through the page tree"""
+        try:
+            return self._descend(index)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            # Malformed tree (missing or wrong /Count): let PyPDF2 flatten it
+            return self.reader.pages[index]
+    
+    def _descend(self, index: int) -> PageObject:
+        if index < 0:
+            raise IndexError(f"page index out of range: {index}")
+        node = self._page_tree()
+        reference = None
+        inherited = {}
+        
+        while node.get("/Type") != "/Page" and "/Kids" in node:
+            for attr in _INHERITABLE:
+                if attr in node:
+                    inherited[attr] = node[attr]
+            
+            for kid_reference in node["/Kids"]:
+                kid = kid_reference.get_object()
+                if kid.get("/Type") == "/Page" or "/Kids" not in kid:
+                    if index == 0:
+                        node, reference = kid, kid_reference
+                        break
+                    index -= 1
+                else:
+                    count = int(kid["/Count"])
+                    if index < count:
+                        node = kid
+                        break
+                    index -= count
+            else:
+                raise IndexError("page index out of range")
+        
+        page = PageObject(self.reader, reference if isinstance(reference, IndirectObject) else None)
+        page.update(node)
+        for attr, value in inherited.items():
+            if attr not in page:
+                page[NameObject(attr)] = value
+        return page
+    
+    def release(self):
+        """Forget resolved objects so pages already emitted can be freed"""
+        self.reader.resolved_objects.clear()
@@ -0,0 +1,213 @@
+"""
+PowerPoint extractor
+Reads the .pptx package directly (zipfile + a streaming ElementTree parse
+of each slide part) rather than building python-pptx's object model.
+Every text-bearing shape is included, also inside group shapes, along
+with tables and the slide's speaker notes; each slide becomes a
+"## Slide N" section. Slides are shared out across worker processes
+when options.workers > 1.
+"""
+
+import posixpath
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+from .markdown import markdown_table
+from .metrics import Stopwatch
+from .options import ExtractionOptions
+from .stream import Section
+
+_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+
+def _tag(prefix: str, name: str) -> str:
+    return f"{{{_NS[prefix]}}}{name}"
+
+
+_P = _tag("a", "p")
+_R = _tag("a", "r")
+_FLD = _tag("a", "fld")
+_BR = _tag("a", "br")
+_T = _tag("a", "t")
+_TBL = _tag("a", "tbl")
+_TR = _tag("a", "tr")
+_TC = _tag("a", "tc")
+_TXBODIES = (_tag("p", "txBody"), _tag("a", "txBody"))
+_SP = _tag("p", "sp")
+_PH = _tag("p", "ph")
+# Elements whose subtree is fully handled once they end, and can be freed
+_SHAPES = (_SP, _tag("p", "graphicFrame"), _tag("p", "pic"), _tag("p", "cxnSp"))
+
+_NOTES_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide"
+
+# Slides per worker task. Parsing a slide takes well under a millisecond,
+# so only decks of several batches are worth a process pool.
+_SLIDE_BATCH = 32
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag in (_R, _FLD):
+            parts.append(child.findtext(_T) or "")
+        elif child.tag == _BR:
+            parts.append("\n")
+    return "".join(parts)
+
+
+def _text_items(stream, placeholder_types: Optional[Tuple[str, ...]] = None) -> List[Tuple[str, object]]:
+    """
+    ("text", str) and ("table", rows) items of a slide or notes part, in
+    document order. With placeholder_types only shapes that are
+    placeholders of those types contribute text.
+    """
+    items = []
+    bodies: List[List[str]] = []
+    tables: List[List[List[str]]] = []
+    rows: List[List[str]] = []
+    cell_text = ""
+    placeholder = None
+    
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag in _TXBODIES:
+                bodies.append([])
+            elif tag == _SP:
+                placeholder = None
+            elif tag == _TBL:
+                tables.append([])
+            elif tag == _TR:
+                rows.append([])
+            continue
+        
+        if tag == _P:
+            if bodies:
+                bodies[-1].append(_paragraph_text(elem))
+            elem.clear()
+        elif tag == _PH:
+            placeholder = elem.get("type", "body")
+        elif tag in _TXBODIES:
+            text = "\n".join(bodies.pop()).strip()
+            if rows:
+                cell_text = text
+            elif text and (placeholder_types is None or placeholder in placeholder_types):
+                items.append(("text", text))
+        elif tag == _TC:
+            rows[-1].append(cell_text)
+            cell_text = ""
+        elif tag == _TR:
+            tables[-1].append(rows.pop())
+        elif tag == _TBL:
+            table = tables.pop()
+            if table:
+                items.append(("table", table))
+        elif tag in _SHAPES:
+            elem.clear()
+    return items
+
+
+def _relationships(archive: zipfile.ZipFile, part: str) -> Dict[str, Tuple[str, str]]:
+    """Relationship id -> (type, target part name) for a package part"""
+    directory, name = posixpath.split(part)
+    rels_part = posixpath.join(directory, "_rels", f"{name}.rels")
+    try:
+        data = archive.open(rels_part)
+    except KeyError:
+        return {}
+    relationships = {}
+    with data:
+        for _, elem in iterparse(data):
+            if elem.tag == _tag("rel", "Relationship") and elem.get("TargetMode") != "External":
+                target = posixpath.normpath(posixpath.join(directory, elem.get("Target")))
+                relationships[elem.get("Id")] = (elem.get("Type"), target)
+    return relationships
+
+
+def slide_parts(archive: zipfile.ZipFile) -> List[str]:
+    """Slide part names in presentation order"""
+    relationships = _relationships(archive, "ppt/presentation.xml")
+    slides = []
+    with archive.open("ppt/presentation.xml") as data:
+        for _, elem in iterparse(data):
+            if elem.tag == _tag("p", "sldId"):
+                rel_id = elem.get(_tag("r", "id"))
+                if rel_id in relationships:
+                    slides.append(relationships[rel_id][1])
+    return slides
+
+
+def _slide_section(archive: zipfile.ZipFile, part: str, number: int) -> Section:
+    watch = Stopwatch()
+    section = [f"## Slide {number}", "-" * 20]
+    text = []
+    
+    with archive.open(part) as data:
+        items = _text_items(data)
+    
+    notes = []
+    for rel_type, target in _relationships(archive, part).values():
+        if rel_type == _NOTES_REL and target in archive.NameToInfo:
+            with archive.open(target) as data:
+                notes = [item for kind, item in _text_items(data, ("body",)) if kind == "text"]
+    
+    for kind, item in items:
+        if kind == "table":
+            section.extend(markdown_table(item))
+            text.extend("\t".join(row) for row in item)
+        else:
+            section.append(item)
+            text.append(item)
+    
+    if not items:
+        section.append("(No text content)")
+    if notes:
+        section.append("")
+        section.append("**Notes**: " + "\n".join(notes))
+        text.extend(notes)
+    
+    section.append("")  # Empty line between slides
+    text = "\n".join(text)
+    return Section("slide", number, "\n".join(section), text=text,
+                   metrics=watch.stop(text_bytes=len(text.encode('utf-8'))))
+
+
+def _extract_slides(pptx_path, batch: List[Tuple[int, str]]) -> List[Section]:
+    """Process-pool entry point: the sections for a batch of slides"""
+    with zipfile.ZipFile(pptx_path) as archive:
+        return [_slide_section(archive, part, number) for number, part in batch]
+
+
+def iter_pptx_sections(pptx_path, options: ExtractionOptions):
+    """Yield the Markdown for each slide as it is read"""
+    with zipfile.ZipFile(pptx_path) as archive:
+        slides = list(enumerate(slide_parts(archive), 1))
+        
+        if options.workers <= 1 or len(slides) <= _SLIDE_BATCH * 2:
+            for number, part in slides:
+                yield _slide_section(archive, part, number)
+            return
+    
+    batches = iter([slides[i:i + _SLIDE_BATCH] for i in range(0, len(slides), _SLIDE_BATCH)])
+    with ProcessPoolExecutor(max_workers=options.workers) as executor:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(executor.submit(_extract_slides, pptx_path, batch))
+            if len(in_flight) >= options.workers * 2:
+                break
+        
+        # Consumed in submission order, so slides stay in order
+        while in_flight:
+            sections = in_flight.popleft().result()
+            batch = next(batches, None)
+            if batch is not None:
+                in_flight.append(executor.submit(_extract_slides, pptx_path, batch))
+            yield from sections
@@ -0,0 +1,149 @@
+"""
+Extractor registry
+==================
+Maps file types to the extractor that renders them as Markdown. Files are
+matched on their leading magic bytes first (peeking inside ZIP containers
+to tell workbooks from decks) and fall back to the file extension.
+
+Built-in extractors are registered by entry point and only imported when
+a file of their type is extracted, so a run that never sees a PDF never
+imports PyPDF2, and a missing backend (one of the third-party packages an
+extractor declares) is reported as a MissingBackendError for the files
+that need it. Any other import failure is raised as is.
+"""
+
+import importlib
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+_SNIFF_BYTES = 8
+
+
+class MissingBackendError(RuntimeError):
+    """An optional package needed for a file format is not installed"""
+
+
+@dataclass(frozen=True)
+class Extractor:
+    """A registered file format and the generator that extracts it"""
+    name: str
+    label: str
+    extensions: Tuple[str, ...]
+    magic: Tuple[bytes, ...]
+    iter_sections: Optional[Callable[..., Iterator[str]]] = None
+    zip_member: Optional[str] = None
+    # "module:function" imported on first use, instead of iter_sections
+    entry_point: Optional[str] = None
+    # Third-party packages the entry point imports
+    backends: Tuple[str, ...] = ()
+    
+    def load(self) -> Callable[..., Iterator[str]]:
+        """The section generator, importing its backend if needed"""
+        if self.iter_sections is not None:
+            return self.iter_sections
+        module_name, _, function = self.entry_point.partition(":")
+        try:
+            module = importlib.import_module(module_name, package=__package__)
+        except ImportError as e:
+            missing = (e.name or "").partition(".")[0]
+            if missing not in self.backends:
+                raise
+            raise MissingBackendError(
+                f"{self.label} extraction needs the '{missing}' package "
+                f"(pip install -r requirements.txt)"
+            ) from e
+        return getattr(module, function)
+    
+    def default_title(self, path) -> str:
+        return f"{self.label} File: {Path(path).name}"
+    
+    def matches_magic(self, head: bytes, path) -> bool:
+        if not any(head.startswith(magic) for magic in self.magic):
+            return False
+        if self.zip_member is None:
+            return True
+        try:
+            with zipfile.ZipFile(path) as archive:
+                return any(name.startswith(self.zip_member) for name in archive.namelist())
+        except zipfile.BadZipFile:
+            return False
+
+
+_EXTRACTORS: Dict[str, Extractor] = {}
+
+
+def register(extractor: Extractor):
+    """Register (or replace) an extractor under its name"""
+    _EXTRACTORS[extractor.name] = extractor
+
+
+def get_extractor(name: str) -> Extractor:
+    """Look up an extractor by name"""
+    try:
+        return _EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown extractor: {name}") from None
+
+
+def extractors() -> List[Extractor]:
+    """All registered extractors"""
+    return list(_EXTRACTORS.values())
+
+
+def detect(path) -> Optional[Extractor]:
+    """Return the extractor for a file, or None if the format is unsupported"""
+    path = Path(path)
+    with open(path, 'rb') as f:
+        head = f.read(_SNIFF_BYTES)
+    
+    for extractor in _EXTRACTORS.values():
+        if extractor.matches_magic(head, path):
+            return extractor
+    
+    suffix = path.suffix.lower()
+    for extractor in _EXTRACTORS.values():
+        if suffix in extractor.extensions:
+            return extractor
+    return None
+
+
+def _register_builtin():
+    register(Extractor(
+        name="pdf",
+        label="PDF",
+        extensions=(".pdf",),
+        magic=(b"%PDF-",),
+        entry_point=".pdf_extractor:iter_pdf_sections",
+        backends=("PyPDF2",),
+    ))
+    register(Extractor(
+        name="excel",
+        label="Excel",
+        extensions=(".xlsx", ".xlsm"),
+        magic=(b"PK\x03\x04",),
+        zip_member="xl/",
+        entry_point=".excel_extractor:iter_excel_sections",
+        backends=("openpyxl", "pandas"),
+    ))
+    register(Extractor(
+        name="pptx",
+        label="PowerPoint",
+        extensions=(".pptx",),
+        magic=(b"PK\x03\x04",),
+        zip_member="ppt/",
+        entry_point=".pptx_extractor:iter_pptx_sections",
+    ))
+    # Opt-in only: no extensions or magic, so detect() keeps choosing "pdf"
+    register(Extractor(
+        name="pdf-layout",
+        label="PDF",
+        extensions=(),
+        magic=(),
+        entry_point=".pdf_layout:iter_layout_sections",
+        backends=("PyPDF2",),
+    ))
+
+
+_register_builtin()
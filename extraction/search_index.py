@@ -0,0 +1,338 @@
+"""
+Full-text search index
+======================
+Persistent inverted index over extracted Markdown, stored in SQLite.
+
+Each Markdown file is split into units at its "## " headings (pages,
+slides, sheets, or plain sections). For every (term, document) pair one
+row holds the postings for all units of that document: unit ordinal,
+term frequency and character offsets, delta + varint encoded and
+zlib-compressed. A query reads one row per matching document per term
+through the primary key, so lookups stay fast as the corpus grows, and
+re-indexing a changed file only rewrites that file's rows. The unit count
+and total unit length BM25 needs are kept as running totals in the meta
+table rather than recounted per query.
+
+Ranking is BM25 over units, so hits point at a specific page or slide.
+"""
+
+import math
+import re
+import sqlite3
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .cache import DEFAULT_CACHE_DIR, file_digest
+
+DEFAULT_INDEX_PATH = DEFAULT_CACHE_DIR / "search-index.sqlite"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SNIPPET_CHARS = 160
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_HEADING_RE = re.compile(r"^## +(.+?)\s*$", re.MULTILINE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    digest TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    doc_id INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    text BLOB NOT NULL,
+    PRIMARY KEY (doc_id, ordinal)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    unit_count INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> Iterable[Tuple[str, int]]:
+    """Yield (lowercased term, character offset) pairs"""
+    for match in _TOKEN_RE.finditer(text):
+        yield match.group().lower(), match.start()
+
+
+def split_units(markdown: str) -> List[Tuple[str, str]]:
+    """Split Markdown into (label, text) units at its "## " headings"""
+    units = []
+    headings = list(_HEADING_RE.finditer(markdown))
+    
+    preamble = markdown[:headings[0].start()] if headings else markdown
+    if preamble.strip():
+        units.append(("Overview", preamble))
+    
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(markdown)
+        units.append((heading.group(1), markdown[heading.start():end]))
+    return units
+
+
+def _encode_varints(values: Iterable[int]) -> bytes:
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def _decode_varints(data: bytes) -> List[int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def _encode_postings(postings: List[Tuple[int, List[int]]]) -> bytes:
+    """[(unit ordinal, [offsets])] -> compressed varint stream"""
+    values = []
+    previous_unit = 0
+    for ordinal, offsets in postings:
+        values.append(ordinal - previous_unit)
+        values.append(len(offsets))
+        previous_offset = 0
+        for offset in offsets:
+            values.append(offset - previous_offset)
+            previous_offset = offset
+        previous_unit = ordinal
+    return zlib.compress(_encode_varints(values))
+
+
+def _decode_postings(data: bytes) -> List[Tuple[int, List[int]]]:
+    values = _decode_varints(zlib.decompress(data))
+    postings = []
+    i = 0
+    ordinal = 0
+    while i < len(values):
+        ordinal += values[i]
+        count = values[i + 1]
+        i += 2
+        offsets = []
+        offset = 0
+        for delta in values[i:i + count]:
+            offset += delta
+            offsets.append(offset)
+        i += count
+        postings.append((ordinal, offsets))
+    return postings
+
+
+@dataclass
+class SearchHit:
+    """One ranked unit (page, slide, sheet or section) matching a query"""
+    score: float
+    path: str
+    label: str
+    snippet: str
+    offsets: List[int]
+
+
+class SearchIndex:
+    """Incrementally updated BM25 index of Markdown documents"""
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else DEFAULT_INDEX_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(_SCHEMA)
+        self._init_totals()
+    
+    def _init_totals(self):
+        """Backfill the corpus totals for indexes written before they were tracked"""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'unit_count'").fetchone():
+            return
+        with self.conn:
+            units, length = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM units"
+            ).fetchone()
+            self.conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                                  (("unit_count", units), ("total_length", length)))
+    
+    def _adjust_totals(self, units: int, length: int):
+        self.conn.execute("UPDATE meta SET value = value + ? WHERE key = 'unit_count'", (units,))
+        self.conn.execute("UPDATE meta SET value = value + ? WHERE key = 'total_length'", (length,))
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    # -- indexing ---------------------------------------------------------
+    
+    def _remove(self, doc_id: int):
+        units, length = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM units WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        self._adjust_totals(-units, -length)
+        self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self.conn.execute("DELETE FROM units WHERE doc_id = ?", (doc_id,))
+        self.conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+    
+    def update_file(self, path) -> bool:
+        """(Re)index one Markdown file if its content changed; returns True if it was indexed"""
+        path = Path(path).resolve()
+        digest = file_digest(path)
+        row = self.conn.execute("SELECT id, digest FROM documents WHERE path = ?", (str(path),)).fetchone()
+        if row and row[1] == digest:
+            return False
+        
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            markdown = f.read()
+        
+        with self.conn:
+            if row:
+                self._remove(row[0])
+            cursor = self.conn.execute(
+                "INSERT INTO documents (path, digest, indexed_at) VALUES (?, ?, ?)",
+                (str(path), digest, time.time())
+            )
+            doc_id = cursor.lastrowid
+            
+            term_postings: Dict[str, List[Tuple[int, List[int]]]] = defaultdict(list)
+            unit_rows = []
+            for ordinal, (label, text) in enumerate(split_units(markdown)):
+                unit_terms: Dict[str, List[int]] = defaultdict(list)
+                length = 0
+                for term, offset in tokenize(text):
+                    unit_terms[term].append(offset)
+                    length += 1
+                for term, offsets in unit_terms.items():
+                    term_postings[term].append((ordinal, offsets))
+                unit_rows.append((doc_id, ordinal, label, length, zlib.compress(text.encode('utf-8'))))
+            
+            self.conn.executemany("INSERT INTO units VALUES (?, ?, ?, ?, ?)", unit_rows)
+            self._adjust_totals(len(unit_rows), sum(unit[3] for unit in unit_rows))
+            self.conn.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?, ?)",
+                ((term, doc_id, len(postings), _encode_postings(postings))
+                 for term, postings in term_postings.items())
+            )
+        return True
+    
+    def update_paths(self, paths: Iterable, pattern: str = "*.md") -> Dict[str, int]:
+        """
+        Index files and directory trees (matching pattern), then drop
+        documents under those directories whose files have disappeared
+        """
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0}
+        roots = []
+        
+        for path in paths:
+            path = Path(path)
+            files = sorted(path.rglob(pattern)) if path.is_dir() else [path]
+            if path.is_dir():
+                roots.append(str(path.resolve()))
+            for file in files:
+                if self.update_file(file):
+                    stats["indexed"] += 1
+                else:
+                    stats["unchanged"] += 1
+        
+        for doc_id, doc_path in self.conn.execute("SELECT id, path FROM documents").fetchall():
+            in_root = any(doc_path.startswith(root.rstrip("/") + "/") for root in roots)
+            if in_root and not Path(doc_path).exists():
+                with self.conn:
+                    self._remove(doc_id)
+                stats["removed"] += 1
+        return stats
+    
+    # -- querying ---------------------------------------------------------
+    
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """BM25-ranked units matching any of the query terms"""
+        terms = sorted({term for term, _ in tokenize(query)})
+        if not terms:
+            return []
+        
+        totals = dict(self.conn.execute("SELECT key, value FROM meta"))
+        total_units, total_length = totals["unit_count"], totals["total_length"]
+        if not total_units:
+            return []
+        avg_length = total_length / total_units
+        
+        scores: Dict[Tuple[int, int], float] = defaultdict(float)
+        offsets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        lengths: Dict[Tuple[int, int], int] = {}
+        
+        for term in terms:
+            rows = self.conn.execute(
+                "SELECT doc_id, unit_count, data FROM postings WHERE term = ?", (term,)
+            ).fetchall()
+            doc_freq = sum(unit_count for _, unit_count, _ in rows)
+            if not doc_freq:
+                continue
+            idf = math.log(1 + (total_units - doc_freq + 0.5) / (doc_freq + 0.5))
+            
+            for doc_id, _, data in rows:
+                postings = _decode_postings(data)
+                missing = [ordinal for ordinal, _ in postings if (doc_id, ordinal) not in lengths]
+                if missing:
+                    placeholders = ",".join("?" * len(missing))
+                    for ordinal, length in self.conn.execute(
+                        f"SELECT ordinal, length FROM units WHERE doc_id = ? AND ordinal IN ({placeholders})",
+                        (doc_id, *missing)
+                    ):
+                        lengths[(doc_id, ordinal)] = length
+                
+                for ordinal, term_offsets in postings:
+                    key = (doc_id, ordinal)
+                    tf = len(term_offsets)
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[key] / avg_length)
+                    scores[key] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    offsets[key].extend(term_offsets)
+        
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        hits = []
+        for (doc_id, ordinal), score in ranked:
+            path, = self.conn.execute("SELECT path FROM documents WHERE id = ?", (doc_id,)).fetchone()
+            label, text = self.conn.execute(
+                "SELECT label, text FROM units WHERE doc_id = ? AND ordinal = ?", (doc_id, ordinal)
+            ).fetchone()
+            hit_offsets = sorted(offsets[(doc_id, ordinal)])
+            hits.append(SearchHit(
+                score=score,
+                path=path,
+                label=label,
+                snippet=_snippet(zlib.decompress(text).decode('utf-8'), hit_offsets[0]),
+                offsets=hit_offsets,
+            ))
+        return hits
+
+
+def _snippet(text: str, offset: int) -> str:
+    start = max(0, offset - SNIPPET_CHARS // 3)
+    snippet = " ".join(text[start:start + SNIPPET_CHARS].split())
+    return ("…" if start else "") + snippet + ("…" if start + SNIPPET_CHARS < len(text) else "")
@@ -0,0 +1,170 @@
+"""
+Streaming Markdown output
+=========================
+Extractors yield their Markdown one section at a time; these helpers push
+the sections through the extraction cache and write them incrementally to
+a temp file that is atomically renamed over the output when complete, so
+peak memory stays at roughly one section regardless of document size.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+PREVIEW_CHARS = 500
+
+_READ_CHUNK_CHARS = 256 * 1024
+
+
+# os.umask can only be read by setting it, which changes it for every
+# thread, so it is read once here rather than while workers are running
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _output_mode(output_path: Path) -> int:
+    """Permissions for a new output: keep an existing file's, else honour the umask"""
+    try:
+        return os.stat(output_path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@dataclass
+class Section:
+    """One page, sheet or slide of extracted Markdown, plus optional structured data"""
+    kind: str
+    number: int
+    markdown: str
+    data: Optional[Dict] = None
+    # Plain text of a page or slide, for structured output
+    text: Optional[str] = None
+    # Timing measured where the section was produced (see extraction.metrics)
+    metrics: Optional[Dict] = None
+
+
+@dataclass
+class ExtractionOutput:
+    """Summary of a streamed extraction; content is only kept when requested"""
+    output_path: Optional[str]
+    chars_written: int = 0
+    preview: str = ""
+    content: Optional[str] = None
+    error: Optional[str] = None
+    units: Optional[int] = None
+    # Units replaced by placeholders (killed for exceeding a budget)
+    failed_units: int = 0
+    bytes_read: int = 0
+    section_data: List[Dict] = field(default_factory=list)
+    # Output was already up to date and left untouched
+    skipped: bool = False
+    # Per-file timing and memory, with a "units" list per page/slide/sheet
+    metrics: Optional[Dict] = None
+
+
+def stream_document(header: Iterable[str], sections: Iterable[Union[str, Section]],
+                    cache=None, extractor: str = None, digest: str = None,
+                    stats: Optional[Dict] = None) -> Iterator[str]:
+    """
+    Yield the document as newline-terminated chunks: the header lines, then
+    the body. The body is replayed from the cache when present, otherwise
+    it is pulled from the (lazy) sections iterable and teed into the cache.
+    
+    Sections may be plain Markdown strings or Section objects; the number
+    of Section objects (pages, sheets, slides) is recorded in
+    stats["units"] and their structured data in stats["data"]. Both are
+    kept with the cache entry so a replay reports the same.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("data", [])
+    
+    for line in header:
+        yield line + "\n"
+    
+    def body_chunks():
+        units = 0
+        for section in sections:
+            if isinstance(section, Section):
+                units += 1
+                if section.data:
+                    stats["data"].append({"kind": section.kind, "number": section.number, **section.data})
+                    if "error" in section.data:
+                        stats["failed_units"] = stats.get("failed_units", 0) + 1
+                section = section.markdown
+            stats["units"] = units
+            yield section + "\n"
+        stats["units"] = units
+    
+    if cache is None or digest is None:
+        yield from body_chunks()
+        return
+    
+    cached_path = cache.document_path(extractor, digest)
+    if cached_path is not None:
+        print("   Reusing cached extraction")
+        stats["cached"] = True
+        meta = cache.document_meta(extractor, digest)
+        stats["units"] = meta.get("units")
+        stats["data"] = meta.get("data", [])
+        with open(cached_path, 'r', encoding='utf-8') as f:
+            for chunk in iter(lambda: f.read(_READ_CHUNK_CHARS), ""):
+                yield chunk
+        return
+    
+    with cache.document_writer(extractor, digest) as cache_file:
+        for chunk in body_chunks():
+            cache_file.write(chunk)
+            yield chunk
+    # Placeholders must not be replayed as if they were the page's content
+    if stats.get("failed_units"):
+        cache.discard_document(extractor, digest)
+        return
+    cache.put_document_meta(extractor, digest, {"units": stats["units"], "data": stats["data"]})
+
+
+def write_stream(chunks: Iterable[str], output_path=None,
+                 return_content: bool = False) -> ExtractionOutput:
+    """
+    Write chunks to output_path through a temp file in the same directory,
+    renaming it into place only once every chunk has been written. With no
+    output_path the chunks are only collected (return_content is implied).
+    """
+    result = ExtractionOutput(output_path=str(output_path) if output_path else None)
+    collected = [] if (return_content or output_path is None) else None
+    preview = []
+    preview_len = 0
+    
+    def consume(write):
+        nonlocal preview_len
+        for chunk in chunks:
+            write(chunk)
+            result.chars_written += len(chunk)
+            if collected is not None:
+                collected.append(chunk)
+            if preview_len < PREVIEW_CHARS:
+                preview.append(chunk[:PREVIEW_CHARS - preview_len])
+                preview_len += len(preview[-1])
+    
+    if output_path is None:
+        consume(lambda chunk: None)
+    else:
+        output_path = Path(output_path)
+        fd, tmp_path = tempfile.mkstemp(dir=output_path.parent,
+                                        prefix=f".{output_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                consume(f.write)
+            # mkstemp creates the file owner-only; match a normal open()
+            os.chmod(tmp_path, _output_mode(output_path))
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    result.preview = "".join(preview)
+    if collected is not None:
+        result.content = "".join(collected)
+    return result
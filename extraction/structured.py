@@ -0,0 +1,190 @@
+"""
+Structured output
+=================
+Machine-readable companions to the Markdown, written in the same pass:
+
+- <stem>.jsonl: one record per PDF page, slide, or Excel sheet row
+- <stem>_parquet/<NN>_<sheet>.parquet: each Excel sheet with its column
+  dtypes (needs the optional pyarrow dependency)
+
+Everything is written to temp files and only renamed into place once the
+extraction finishes, mirroring the Markdown writer.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .registry import MissingBackendError
+from .stream import Section
+
+
+def jsonl_path(output_path) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.jsonl")
+
+
+def parquet_dir(output_path) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_parquet")
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_") or "sheet"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        if (e.name or "").partition(".")[0] != "pyarrow":
+            raise
+        raise MissingBackendError("Parquet output needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+class SheetParquetWriter:
+    """
+    Appends DataFrame chunks of one sheet to a Parquet file
+    
+    The first chunk fixes the schema. Later chunks are cast to it; values
+    that cannot be represented in a column's type (a string turning up in
+    a numeric column past the first chunk) are coerced and counted.
+    """
+    
+    def __init__(self, path: Path):
+        self.pa = _require_pyarrow()
+        self.path = path
+        self.schema = None
+        self.columns: List[str] = []
+        self.coerced = 0
+        self._writer = None
+    
+    def write_chunk(self, frame, columns: List[str]):
+        import pandas as pd
+        
+        frame = frame.copy()
+        frame.columns = columns[:frame.shape[1]]
+        for name in frame.columns:
+            # Mixed-type columns are stored as text
+            if frame[name].dtype == object:
+                frame[name] = frame[name].map(lambda value: None if value is None else str(value))
+        
+        if self._writer is None:
+            self.columns = list(frame.columns)
+            table = self.pa.Table.from_pandas(frame, preserve_index=False)
+            # A column that is empty in the first chunk has no type yet;
+            # store it as text so later values still fit
+            fields = [field.with_type(self.pa.string()) if self.pa.types.is_null(field.type) else field
+                      for field in table.schema]
+            self.schema = self.pa.schema(fields)
+            table = table.cast(self.schema)
+            self._writer = self.pa.parquet.ParquetWriter(str(self.path), self.schema)
+            self._writer.write_table(table)
+            return
+        
+        frame = frame.reindex(columns=self.columns)
+        try:
+            table = self.pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+        except (self.pa.ArrowInvalid, self.pa.ArrowTypeError):
+            for field in self.schema:
+                series = frame[field.name]
+                if self.pa.types.is_string(field.type) or self.pa.types.is_large_string(field.type):
+                    frame[field.name] = series.map(lambda value: None if pd.isna(value) else str(value))
+                elif self.pa.types.is_integer(field.type) or self.pa.types.is_floating(field.type):
+                    coerced = pd.to_numeric(series, errors="coerce")
+                    self.coerced += int((coerced.isna() & series.notna()).sum())
+                    frame[field.name] = coerced
+            table = self.pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False, safe=False)
+        self._writer.write_table(table)
+    
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class StructuredWriter:
+    """Collects JSONL records and Parquet sheets for one extracted file"""
+    
+    def __init__(self, output_path, source: str, jsonl: bool = True, parquet: bool = False):
+        self.output_path = Path(output_path)
+        self.source = source
+        self.records = 0
+        self._tmp_dir = Path(tempfile.mkdtemp(dir=self.output_path.parent,
+                                              prefix=f".{self.output_path.stem}.", suffix=".tmp"))
+        self._jsonl = open(self._tmp_dir / "records.jsonl", 'w', encoding='utf-8') if jsonl else None
+        self._parquet = parquet
+        self._sheets: Dict[str, SheetParquetWriter] = {}
+        if parquet:
+            _require_pyarrow()
+    
+    def _write(self, record: Dict):
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps(record, ensure_ascii=False, default=str))
+            self._jsonl.write("\n")
+            self.records += 1
+    
+    def write_section(self, section: Section):
+        """Record a page or slide, with any tables the extractor reconstructed"""
+        record = {
+            "source": self.source,
+            "kind": section.kind,
+            "number": section.number,
+            "text": section.text,
+        }
+        if section.data and "tables" in section.data:
+            record["tables"] = section.data["tables"]
+        self._write(record)
+    
+    def write_row(self, sheet: str, number: int, columns: List[str], row: tuple):
+        """Record one sheet row as a column -> value mapping"""
+        self._write({
+            "source": self.source,
+            "kind": "row",
+            "sheet": sheet,
+            "number": number,
+            "values": {name: value for name, value in zip(columns, row)},
+        })
+    
+    @property
+    def wants_rows(self) -> bool:
+        return self._jsonl is not None
+    
+    def sheet_parquet(self, sheet: str, number: int) -> Optional[SheetParquetWriter]:
+        """Parquet writer for a sheet, or None when Parquet output is off"""
+        if not self._parquet:
+            return None
+        writer = SheetParquetWriter(self._tmp_dir / f"{number:02d}_{_slug(sheet)}.parquet")
+        self._sheets[sheet] = writer
+        return writer
+    
+    def close(self, success: bool = True):
+        """Move the finished files into place, or discard them on failure"""
+        if self._jsonl is not None:
+            self._jsonl.close()
+        for writer in self._sheets.values():
+            writer.close()
+        
+        try:
+            if not success:
+                return
+            if self._jsonl is not None:
+                os.replace(self._tmp_dir / "records.jsonl", jsonl_path(self.output_path))
+            if self._sheets:
+                target = parquet_dir(self.output_path)
+                if target.exists():
+                    shutil.rmtree(target)
+                parts = self._tmp_dir / "parquet"
+                parts.mkdir()
+                for writer in self._sheets.values():
+                    if writer.path.exists():
+                        os.replace(writer.path, parts / writer.path.name)
+                os.replace(parts, target)
+        finally:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
@@ -0,0 +1,182 @@
+"""
+Supervised unit extraction
+==========================
+Runs page (or slide) extraction in long-lived worker processes that the
+parent can kill. Each unit gets a wall-clock budget; a worker that blows
+it, or dies (crash, out-of-memory kill), is terminated and replaced, and
+the unit is emitted as a placeholder so the rest of the document and the
+batch keep going. A per-worker memory budget is enforced with
+RLIMIT_AS, so a runaway allocation fails inside the worker instead of
+taking the machine down.
+
+Sections are yielded in unit order; at most a few units per worker are
+buffered ahead of the slowest outstanding one.
+"""
+
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from .stream import Section
+
+# How far ahead of the oldest unfinished unit work may be handed out
+_LOOKAHEAD_PER_WORKER = 4
+
+
+def _address_space_bytes() -> int:
+    """Current virtual memory size of this process (0 if unknown)"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _worker_main(conn, path, open_document: Callable, render: Callable, kind: str, cache,
+                 memory_budget: Optional[int]):
+    """Worker loop: receive unit numbers, send back rendered Sections"""
+    if memory_budget and resource is not None:
+        # The budget is on top of what the interpreter and libraries already map
+        limit = _address_space_bytes() + memory_budget
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    
+    with open_document(path) as document:
+        while True:
+            unit = conn.recv()
+            if unit is None:
+                break
+            started = time.monotonic()
+            try:
+                section = render(document, unit, cache)
+            except MemoryError:
+                print(f"⚠️  {kind.capitalize()} {unit + 1} of {path}: exceeded memory budget")
+                section = placeholder_section(kind, unit, "exceeded memory budget",
+                                              time.monotonic() - started)
+            conn.send(section)
+    conn.close()
+
+
+class _Worker:
+    """One supervised process and the unit it is working on"""
+    
+    def __init__(self, context, args):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, *args), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.unit = None
+        self.started = None
+    
+    def submit(self, unit: int):
+        self.conn.send(unit)
+        self.unit = unit
+        self.started = time.monotonic()
+    
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+    
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+def placeholder_section(kind: str, unit: int, reason: str, elapsed: float) -> Section:
+    """Stand-in for a unit whose worker was killed"""
+    number = unit + 1
+    markdown = "\n".join([
+        f"## {kind.capitalize()} {number}",
+        "-" * 20,
+        f"(Skipped: {reason})",
+        "",
+    ])
+    return Section(kind, number, markdown, data={"error": reason}, text="",
+                   metrics={"wall_s": round(elapsed, 6), "cpu_s": None,
+                            "peak_rss_bytes": None, "text_bytes": 0, "killed": reason})
+
+
+def iter_supervised(path, units: range, open_document: Callable, render: Callable,
+                    kind: str, workers: int = 1, cache=None,
+                    timeout: Optional[float] = None,
+                    memory_budget: Optional[int] = None) -> Iterator[Section]:
+    """
+    Yield render(document, unit, cache) for each unit, in order, computed
+    in supervised worker processes. open_document(path) must return a
+    context manager; both callables must be importable module-level
+    functions so they can be sent to the workers.
+    """
+    if not units:
+        return
+    context = multiprocessing.get_context()
+    args = (path, open_document, render, kind, cache, memory_budget)
+    next_unit = next_to_assign = units.start
+    ready = {}
+    lookahead = max(1, workers) * _LOOKAHEAD_PER_WORKER
+    pool = [_Worker(context, args) for _ in range(max(1, min(workers, len(units))))]
+    
+    def replace(worker):
+        worker.kill()
+        pool[pool.index(worker)] = _Worker(context, args)
+    
+    def assign():
+        nonlocal next_to_assign
+        limit = min(units.stop, next_unit + lookahead)
+        for worker in pool:
+            if worker.unit is None and next_to_assign < limit:
+                worker.submit(next_to_assign)
+                next_to_assign += 1
+    
+    try:
+        assign()
+        while next_unit < units.stop:
+            busy = [worker for worker in pool if worker.unit is not None]
+            wait_for = None
+            if timeout is not None and busy:
+                oldest = min(worker.started for worker in busy)
+                wait_for = max(0.0, oldest + timeout - time.monotonic())
+            readable = wait([worker.conn for worker in busy], wait_for)
+            
+            for worker in busy:
+                unit = worker.unit
+                elapsed = time.monotonic() - worker.started
+                if worker.conn in readable:
+                    try:
+                        ready[unit] = worker.conn.recv()
+                        worker.unit = None
+                    except (EOFError, OSError):
+                        worker.process.join(timeout=1)
+                        reason = f"worker exited with code {worker.process.exitcode}"
+                        print(f"⚠️  {kind.capitalize()} {unit + 1} of {path}: {reason}")
+                        ready[unit] = placeholder_section(kind, unit, reason, elapsed)
+                        replace(worker)
+                elif timeout is not None and elapsed >= timeout:
+                    reason = f"exceeded {timeout:g}s time limit"
+                    print(f"⚠️  {kind.capitalize()} {unit + 1} of {path}: {reason}")
+                    ready[unit] = placeholder_section(kind, unit, reason, elapsed)
+                    replace(worker)
+            
+            while next_unit in ready:
+                yield ready.pop(next_unit)
+                next_unit += 1
+            assign()
+    finally:
+        for worker in pool:
+            if worker.unit is not None:
+                worker.kill()
+            else:
+                worker.stop()
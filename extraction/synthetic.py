@@ -0,0 +1,133 @@
+"""
+Synthetic documents for benchmarking
+====================================
+Deterministic generators for PDFs, workbooks and decks of a given size,
+built locally with no network access or external tools:
+
+- PDFs are written by hand (Helvetica text, a two-level page tree) so no
+  PDF writer dependency is needed
+- Workbooks use openpyxl's write-only mode, decks use python-pptx
+"""
+
+import datetime
+import random
+from pathlib import Path
+
+_WORDS = (
+    "audience campaign budget pacing inventory attribution segment bid "
+    "creative impression conversion forecast publisher deal supply "
+    "frequency reach viewability dashboard export integration pipeline "
+    "measurement lookalike optimization advertiser agency report"
+).split()
+
+# Pages per intermediate /Pages node in generated PDFs
+_PDF_FANOUT = 32
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(path, pages: int, lines_per_page: int = 40, seed: int = 0) -> Path:
+    """Write a text PDF with the given number of pages"""
+    rng = random.Random(seed)
+    path = Path(path)
+    
+    # Object numbers: 1 catalog, 2 root /Pages, 3 font, then the
+    # intermediate /Pages nodes, then a (page, content) pair per page.
+    groups = [range(start, min(start + _PDF_FANOUT, pages)) for start in range(0, pages, _PDF_FANOUT)]
+    first_group = 4
+    first_page = first_group + len(groups)
+    
+    def page_obj(i):
+        return first_page + 2 * i
+    
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: ("<< /Type /Pages /Kids [%s] /Count %d "
+            "/Resources << /Font << /F1 3 0 R >> >> /MediaBox [0 0 612 792] >>" % (
+                " ".join(f"{first_group + g} 0 R" for g in range(len(groups))), pages)).encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for g, group in enumerate(groups):
+        kids = " ".join(f"{page_obj(i)} 0 R" for i in group)
+        objects[first_group + g] = f"<< /Type /Pages /Parent 2 0 R /Kids [{kids}] /Count {len(group)} >>".encode()
+    
+    for g, group in enumerate(groups):
+        for i in group:
+            lines = [f"Page {i + 1}"] + [_sentence(rng, rng.randint(6, 14)) for _ in range(lines_per_page)]
+            ops = ["BT", "/F1 10 Tf", "12 TL", "50 750 Td"]
+            ops += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+            ops.append("ET")
+            stream = "\n".join(ops).encode("latin-1")
+            objects[page_obj(i)] = f"<< /Type /Page /Parent {first_group + g} 0 R /Contents {page_obj(i) + 1} 0 R >>".encode()
+            objects[page_obj(i) + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+    
+    with open(path, 'wb') as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = {}
+        for number in sorted(objects):
+            offsets[number] = f.tell()
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (number, objects[number]))
+        xref_offset = f.tell()
+        count = max(objects) + 1
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % count)
+        for number in range(1, count):
+            f.write(b"%010d 00000 n \n" % offsets[number])
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, xref_offset))
+    return path
+
+
+def make_workbook(path, sheets: int, rows: int, cols: int, seed: int = 0) -> Path:
+    """Write an .xlsx with sheets × rows × cols of mixed text, numbers and dates"""
+    from openpyxl import Workbook
+    
+    rng = random.Random(seed)
+    path = Path(path)
+    workbook = Workbook(write_only=True)
+    base_date = datetime.date(2025, 1, 1)
+    
+    for s in range(sheets):
+        sheet = workbook.create_sheet(f"Sheet {s + 1}")
+        sheet.append([f"Column {c + 1}" for c in range(cols)])
+        for r in range(rows):
+            row = []
+            for c in range(cols):
+                kind = c % 4
+                if kind == 0:
+                    row.append(rng.choice(_WORDS))
+                elif kind == 1:
+                    row.append(rng.randint(0, 100000))
+                elif kind == 2:
+                    row.append(round(rng.random() * 1000, 2))
+                else:
+                    row.append(base_date + datetime.timedelta(days=r % 365))
+            sheet.append(row)
+    
+    workbook.save(path)
+    return path
+
+
+def make_deck(path, slides: int, bullets: int = 6, seed: int = 0) -> Path:
+    """Write a .pptx with the given number of title-and-content slides"""
+    from pptx import Presentation
+    
+    rng = random.Random(seed)
+    path = Path(path)
+    deck = Presentation()
+    layout = deck.slide_layouts[1]
+    
+    for i in range(slides):
+        slide = deck.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {i + 1}: {_sentence(rng, 4)}"
+        body = slide.placeholders[1].text_frame
+        body.text = _sentence(rng, 10)
+        for _ in range(bullets - 1):
+            body.add_paragraph().text = _sentence(rng, rng.randint(6, 12))
+    
+    deck.save(path)
+    return path
@@ -4,24 +4,64 @@ P360 Figma Asset Downloader
 ============================
 Direct Figma API integration to download assets and analyze design components.
 Bypasses MCP issues and provides direct control over asset extraction.
+
+Commands: single [node_id], all, sync, analyze, dedupe; add --offline to
+serve file data from .figma-cache/ only.
+
+Environment:
+  FIGMA_API_KEY, FIGMA_FILE_KEY   required
+  FIGMA_NODE_ID                   default node for `single`
+  FIGMA_API_BASE_URL              API root, e.g. a local stand-in server
+  FIGMA_RATE_LIMIT                starting API rate in requests/second (5)
+  FIGMA_CACHE_TTL                 seconds cached file data stays fresh (3600)
+  FIGMA_CACHE_MAX_MB              size cap of .figma-cache/ (512)
+  FIGMA_OFFLINE=1                 same as --offline
 """
 
 import os
 import sys
-import requests
+import asyncio
 import json
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from urllib.parse import urlparse
-import time
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 from dotenv import load_dotenv
 
+from figma_asset_store import AssetStore
+from figma_cache import DEFAULT_MAX_BYTES, DEFAULT_TTL, CacheEntry, ResponseCache
+from figma_client import DEFAULT_BASE_URL, DEFAULT_CONCURRENCY, FigmaClient, FigmaRequestError
+from figma_node_store import write_store
+from figma_rate_limit import AdaptiveRateLimiter
+from figma_stream import FileScan, scan_file
+from figma_sync import SyncState, changed_nodes
+
 # Load environment variables
 load_dotenv()
 
+# Figma API limit on node ids per render request
+BATCH_SIZE = 50
+# Formats rendered for every image node, with their scale
+RENDER_FORMATS = (("png", 2.0), ("svg", 1.0))
+# Render requests in flight at once; the rate limiter still paces them
+RENDER_CONCURRENCY = 4
+# Image URLs waiting for download; when full, further render requests wait
+DOWNLOAD_QUEUE_SIZE = 2 * BATCH_SIZE
+
+
+class _Tee:
+    """Writes each chunk to several files"""
+    
+    def __init__(self, *files):
+        self.files = files
+    
+    def write(self, data: bytes):
+        for f in self.files:
+            f.write(data)
+
 class FigmaAssetDownloader:
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 offline: bool = False):
         self.api_token = os.getenv('FIGMA_API_KEY')
         self.file_key = os.getenv('FIGMA_FILE_KEY') 
         self.node_id = os.getenv('FIGMA_NODE_ID')
@@ -31,11 +71,13 @@ class FigmaAssetDownloader:
         if not self.file_key:
             raise ValueError("FIGMA_FILE_KEY not found in environment variables")
             
-        self.base_url = "https://api.figma.com/v1"
-        self.headers = {
-            'X-Figma-Token': self.api_token,
-            'Content-Type': 'application/json'
-        }
+        self.base_url = base_url or os.getenv('FIGMA_API_BASE_URL', DEFAULT_BASE_URL)
+        
+        # The sync methods below drive one long-lived loop, so the client's
+        # keep-alive connections are reused across calls
+        self._loop = asyncio.new_event_loop()
+        self.limiter = AdaptiveRateLimiter(rate=float(os.getenv('FIGMA_RATE_LIMIT', '5')))
+        self.client = FigmaClient(self.api_token, self.base_url, concurrency, limiter=self.limiter)
         
         # Create output directories
         self.assets_dir = Path('assets')
@@ -44,105 +86,170 @@ class FigmaAssetDownloader:
         
         for directory in [self.assets_dir, self.figma_data_dir, self.components_dir]:
             directory.mkdir(parents=True, exist_ok=True)
+        self.asset_store = AssetStore(self.assets_dir)
+        self.failed_nodes = set()
+        
+        # Response cache shared with scripts/smart-figma-fetch.js
+        self.offline = offline or os.getenv('FIGMA_OFFLINE', '') in ('1', 'true', 'yes')
+        self.cache = ResponseCache(
+            Path('.figma-cache'),
+            ttl=float(os.getenv('FIGMA_CACHE_TTL', DEFAULT_TTL)),
+            max_bytes=int(float(os.getenv('FIGMA_CACHE_MAX_MB', DEFAULT_MAX_BYTES / 2**20)) * 2**20),
+        )
     
     def log(self, message: str):
         """Enhanced logging with timestamps"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         print(f"[{timestamp}] {message}")
     
+    def _run(self, coro):
+        """Run a coroutine on the downloader's event loop"""
+        return self._loop.run_until_complete(coro)
+    
+    def close(self):
+        """Close pooled connections and the event loop"""
+        if not self._loop.is_closed():
+            self._run(self.client.close())
+            self._loop.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def make_request(self, endpoint: str) -> Optional[Dict]:
         """Make authenticated request to Figma API with error handling"""
-        url = f"{self.base_url}/{endpoint}"
-        
+        return self._run(self._request(endpoint))
+    
+    async def _request(self, endpoint: str) -> Optional[Dict]:
+        if self.offline:
+            self.log(f"📴 Offline: skipping request to {endpoint}")
+            return None
         try:
             self.log(f"Making request to: {endpoint}")
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return await self.client.get_json(endpoint)
+        except FigmaRequestError as e:
             self.log(f"❌ Request failed: {e}")
-            if hasattr(e.response, 'text'):
-                self.log(f"Response: {e.response.text}")
+            if e.body:
+                self.log(f"Response: {e.body}")
+            return None
+    
+    def get_file_data(self, expected_version: Optional[str] = None) -> Optional[Dict]:
+        """
+        Fetch complete file data from Figma (or the cache) and analyze it.
+        Returns the parsed response, which holds the whole document in
+        memory; scan_file_data gives the same analysis from a streaming scan.
+        """
+        entry, scan = self._load_file_data(expected_version)
+        if not scan:
             return None
+        with open(entry.path, 'r') as f:
+            return json.load(f)['data']
     
-    def get_file_data(self) -> Optional[Dict]:
-        """Fetch complete file data from Figma"""
+    def scan_file_data(self, expected_version: Optional[str] = None) -> Optional[FileScan]:
+        """
+        Fetch file data from Figma (or the cache) and scan it in one streaming
+        pass. A cached copy that predates expected_version is refetched.
+        """
+        _, scan = self._load_file_data(expected_version)
+        return scan
+    
+    def _load_file_data(self, expected_version: Optional[str]) -> Tuple[Optional[CacheEntry], Optional[FileScan]]:
         self.log("🎯 FETCHING FIGMA FILE DATA...")
         
         endpoint = f"files/{self.file_key}"
         if self.node_id:
             endpoint += f"?ids={self.node_id}"
             
-        data = self.make_request(endpoint)
-        
-        if data:
-            # Save raw data for analysis
-            output_file = self.figma_data_dir / f"file_data_{self.file_key}.json"
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            self.log(f"✅ File data saved to: {output_file}")
-            
+        entry = self._run(self._fetch_file_data(endpoint))
+        scan = self._scan_entry(entry)
+        if scan and expected_version and not self.offline \
+                and scan.metadata.get('version') != expected_version:
+            self.log(f"🔄 Cached version {scan.metadata.get('version')} is behind {expected_version}")
+            entry = self._run(self._fetch_file_data(endpoint, refresh=True))
+            scan = self._scan_entry(entry)
+        
+        if scan:
             # Extract key information
-            if 'document' in data:
-                self.log(f"📄 File Name: {data.get('name', 'Unknown')}")
-                self.log(f"📄 Last Modified: {data.get('lastModified', 'Unknown')}")
-                self.log(f"📄 Version: {data.get('version', 'Unknown')}")
-                
-                # Count components and frames
-                self._analyze_file_structure(data['document'])
+            self.log(f"📄 File Name: {scan.metadata.get('name', 'Unknown')}")
+            self.log(f"📄 Last Modified: {scan.metadata.get('lastModified', 'Unknown')}")
+            self.log(f"📄 Version: {scan.metadata.get('version', 'Unknown')}")
+            
+            # Count components and frames
+            self._analyze_file_structure(scan)
         
-        return data
+        return entry, scan
     
-    def _analyze_file_structure(self, document: Dict):
-        """Analyze file structure and count elements"""
-        components = []
-        frames = []
-        images = []
-        
-        def traverse_node(node: Dict, path: str = ""):
-            current_path = f"{path}/{node.get('name', 'unnamed')}"
-            node_type = node.get('type', 'unknown')
-            
-            if node_type == 'COMPONENT':
-                components.append({
-                    'id': node.get('id'),
-                    'name': node.get('name'),
-                    'path': current_path
-                })
-            elif node_type == 'FRAME':
-                frames.append({
-                    'id': node.get('id'),
-                    'name': node.get('name'),
-                    'path': current_path
-                })
-            elif 'fills' in node:
-                # Check for image fills
-                for fill in node.get('fills', []):
-                    if fill.get('type') == 'IMAGE':
-                        images.append({
-                            'node_id': node.get('id'),
-                            'name': node.get('name'),
-                            'image_ref': fill.get('imageRef'),
-                            'path': current_path
-                        })
-            
-            # Recursively process children
-            for child in node.get('children', []):
-                traverse_node(child, current_path)
+    async def _fetch_file_data(self, endpoint: str, refresh: bool = False) -> Optional[CacheEntry]:
+        """
+        The cache entry holding current file data: used as is while fresh,
+        otherwise revalidated with its ETag or replaced by streaming the API
+        response straight into the cache and figma_data/file_data_<key>.json
+        """
+        entry = self.cache.lookup(self.file_key, self.node_id)
+        if entry and (self.offline or (self.cache.is_fresh(entry) and not refresh)):
+            self.cache.touch(entry)
+            self.log(f"💾 Using cached file data ({entry.age / 60:.0f} minutes old): {entry.path.name}")
+            return entry
+        if self.offline:
+            self.log("📴 Offline and no cached file data")
+            return None
         
-        traverse_node(document)
+        output_file = self.figma_data_dir / f"file_data_{self.file_key}.json"
+        raw_temp = output_file.with_name(f".{output_file.name}.tmp")
+        try:
+            self.log(f"Making request to: {endpoint}")
+            with ExitStack() as stack:
+                def open_sink(etag: Optional[str]):
+                    cache_file = stack.enter_context(self.cache.open_entry(self.file_key, self.node_id, etag))
+                    raw_file = stack.enter_context(open(raw_temp, 'wb'))
+                    return _Tee(cache_file, raw_file)
+                
+                status, _ = await self.client.stream_json(
+                    endpoint, open_sink, self.cache.etag(entry) if entry else None)
+        except FigmaRequestError as e:
+            self.log(f"❌ Request failed: {e}")
+            raw_temp.unlink(missing_ok=True)
+            if entry:
+                self.log("💾 Using stale cached file data (may be outdated)")
+                return entry
+            return None
         
+        if status == 304:
+            self.log("💾 Cached file data is still current (304 Not Modified)")
+            return self.cache.revalidate(entry)
+        
+        # Saved as received, without re-serialising
+        os.replace(raw_temp, output_file)
+        self.log(f"✅ File data saved to: {output_file}")
+        return self.cache.lookup(self.file_key, self.node_id)
+    
+    def _scan_entry(self, entry: Optional[CacheEntry]) -> Optional[FileScan]:
+        """Stream a cached response through the single-pass scanner"""
+        if entry is None:
+            return None
+        with open(entry.path, 'rb') as f:
+            scan = scan_file(f, wrapper_key='data')
+        if not scan.node_count:
+            self.log(f"❌ No document in file data: {scan.metadata.get('err', 'unknown response')}")
+            return None
+        return scan
+    
+    def _analyze_file_structure(self, scan: FileScan):
+        """Report and save the components, frames and images found by the scan"""
         # Log analysis results
         self.log(f"🔍 ANALYSIS RESULTS:")
-        self.log(f"   📦 Components: {len(components)}")
-        self.log(f"   🖼️  Frames: {len(frames)}")
-        self.log(f"   🎨 Images: {len(images)}")
+        self.log(f"   🧩 Nodes: {scan.node_count}")
+        self.log(f"   📦 Components: {len(scan.components)}")
+        self.log(f"   🖼️  Frames: {len(scan.frames)}")
+        self.log(f"   🎨 Images: {len(scan.images)}")
         
         # Save analysis
         analysis = {
-            'components': components,
-            'frames': frames,
-            'images': images,
+            'components': scan.components,
+            'frames': scan.frames,
+            'images': scan.images,
             'analyzed_at': datetime.now().isoformat()
         }
         
@@ -151,28 +258,44 @@ class FigmaAssetDownloader:
             json.dump(analysis, f, indent=2)
         
         self.log(f"📊 Analysis saved to: {analysis_file}")
+        
+        store_file = self.figma_data_dir / f"nodes_{self.file_key}.sqlite"
+        write_store(scan.nodes, store_file, {
+            'file_key': self.file_key,
+            'name': str(scan.metadata.get('name', '')),
+            'version': str(scan.metadata.get('version', '')),
+            'lastModified': str(scan.metadata.get('lastModified', '')),
+        })
+        self.log(f"🗂️  Node store saved to: {store_file}")
         return analysis
     
     def get_image_assets(self, node_ids: List[str], format_type: str = "png", scale: float = 2.0) -> Optional[Dict]:
         """Download image assets for specific nodes"""
+        return self._run(self._get_image_assets(node_ids, format_type, scale))
+    
+    async def _get_image_assets(self, node_ids: List[str], format_type: str, scale: float) -> Optional[Dict]:
         self.log(f"🖼️  DOWNLOADING {format_type.upper()} ASSETS...")
         
         # Prepare node IDs string
         ids_param = ','.join(node_ids)
         endpoint = f"images/{self.file_key}?ids={ids_param}&format={format_type}&scale={scale}"
         
-        response = self.make_request(endpoint)
+        response = await self._request(endpoint)
         
         if response and 'images' in response:
             self.log(f"✅ Found {len(response['images'])} image URLs")
             
-            # Download each image
-            downloaded_count = 0
-            for node_id, image_url in response['images'].items():
-                if image_url:
-                    success = self._download_image(image_url, node_id, format_type)
-                    if success:
-                        downloaded_count += 1
+            self.failed_nodes.update(node_id for node_id, image_url in response['images'].items()
+                                     if not image_url)
+            
+            # Download the images concurrently; the client bounds how many run at once
+            downloads = [
+                self._download_image(image_url, node_id, format_type)
+                for node_id, image_url in response['images'].items()
+                if image_url
+            ]
+            downloaded_count = sum(await asyncio.gather(*downloads))
+            self.asset_store.save()
                         
             self.log(f"📥 Successfully downloaded {downloaded_count} images")
             
@@ -183,48 +306,59 @@ class FigmaAssetDownloader:
                 
         return response
     
-    def _download_image(self, image_url: str, node_id: str, format_type: str) -> bool:
+    async def _download_image(self, image_url: str, node_id: str, format_type: str) -> bool:
         """Download individual image file"""
         try:
             self.log(f"📥 Downloading {node_id}.{format_type}...")
             
-            response = requests.get(image_url, stream=True)
-            response.raise_for_status()
-            
             # Create filename
             filename = f"{node_id}.{format_type}"
             filepath = self.assets_dir / filename
             
-            # Write file
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            data = await self.client.fetch(image_url)
+            digest, created = self.asset_store.put_bytes(filename, data)
             
-            self.log(f"✅ Saved: {filepath}")
+            if created:
+                self.log(f"✅ Saved: {filepath}")
+            else:
+                self.log(f"♻️  Linked: {filepath} (identical render {digest[:12]})")
             return True
             
         except Exception as e:
             self.log(f"❌ Failed to download {node_id}: {e}")
+            self.failed_nodes.add(node_id)
             return False
     
-    def extract_all_image_nodes(self, file_data: Dict) -> List[str]:
-        """Extract all node IDs that contain images"""
-        image_nodes = []
-        
-        def find_image_nodes(node: Dict):
-            # Check if node has image fills
-            if 'fills' in node:
-                for fill in node.get('fills', []):
-                    if fill.get('type') == 'IMAGE':
-                        image_nodes.append(node.get('id'))
-                        break
-            
-            # Check children
-            for child in node.get('children', []):
-                find_image_nodes(child)
+    def deduplicate_assets(self) -> Dict:
+        """Move previously downloaded assets into the content-addressed store"""
+        self.log("♻️  DEDUPLICATING EXISTING ASSETS...")
+        
+        for path in sorted(self.assets_dir.iterdir()):
+            if path.is_file() and not path.name.startswith('.'):
+                self.asset_store.adopt(path)
+        self.asset_store.save()
+        removed = self.asset_store.collect_garbage()
         
-        if 'document' in file_data:
-            find_image_nodes(file_data['document'])
+        stats = self.asset_store.stats()
+        self.log(f"📦 {stats['assets']} assets stored as {stats['blobs']} unique blobs")
+        self.log(f"💾 {stats['logical_bytes']:,} bytes of renders in {stats['stored_bytes']:,} bytes on disk")
+        if removed:
+            self.log(f"🧹 Removed {removed} unreferenced blobs")
+        return stats
+    
+    def extract_all_image_nodes(self, file_data: Union[Dict, FileScan]) -> List[str]:
+        """All node IDs that contain images, from parsed file data or a file scan"""
+        if isinstance(file_data, FileScan):
+            image_nodes = file_data.image_nodes
+        else:
+            image_nodes = []
+            # Pre-order walk without recursion, so deep files cannot overflow
+            stack = [file_data['document']] if 'document' in file_data else []
+            while stack:
+                node = stack.pop()
+                if any(fill.get('type') == 'IMAGE' for fill in node.get('fills') or []):
+                    image_nodes.append(node.get('id'))
+                stack.extend(reversed(node.get('children', [])))
         
         self.log(f"🔍 Found {len(image_nodes)} nodes with images")
         return image_nodes
@@ -252,7 +386,7 @@ class FigmaAssetDownloader:
         self.log("🚀 STARTING COMPLETE ASSET DOWNLOAD...")
         
         # Step 1: Get file data
-        file_data = self.get_file_data()
+        file_data = self.scan_file_data()
         if not file_data:
             self.log("❌ Failed to get file data")
             return {"success": False, "error": "Failed to get file data"}
@@ -264,28 +398,11 @@ class FigmaAssetDownloader:
             return {"success": False, "error": "No image nodes found"}
         
         # Step 3: Download assets in batches (Figma API limits)
-        batch_size = 50  # Figma API limit
-        results = []
-        
-        for i in range(0, len(image_nodes), batch_size):
-            batch = image_nodes[i:i+batch_size]
-            self.log(f"📦 Processing batch {i//batch_size + 1}: {len(batch)} nodes")
-            
-            # Download PNG and SVG for each batch
-            png_result = self.get_image_assets(batch, "png", 2.0)
-            svg_result = self.get_image_assets(batch, "svg", 1.0)
-            
-            results.append({
-                'batch': i//batch_size + 1,
-                'nodes': batch,
-                'png': png_result,
-                'svg': svg_result
-            })
-            
-            # Rate limiting
-            time.sleep(1)
+        results = self._download_batches(image_nodes)
         
         self.log(f"🎉 DOWNLOAD COMPLETE! Processed {len(image_nodes)} total nodes")
+        self.log(f"🚦 Rate limit: {self.limiter.rate:.1f} req/s, "
+                 f"{self.limiter.throttled} throttled, {self.client.retries} retried")
         
         # Save complete results
         results_file = self.figma_data_dir / f"download_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -304,6 +421,158 @@ class FigmaAssetDownloader:
             'results': results,
             'results_file': str(results_file)
         }
+    
+    def _download_batches(self, image_nodes: List[str]) -> List[Dict]:
+        """Render and download PNG and SVG for the nodes in API-sized batches"""
+        return self._run(self._render_pipeline(image_nodes))
+    
+    @staticmethod
+    async def _run_stages(*stages):
+        """
+        Run pipeline stages concurrently. The first stage to fail cancels the
+        others, which may be blocked on a queue, and its error is raised.
+        (asyncio.TaskGroup does this from Python 3.11.)
+        """
+        tasks = [asyncio.ensure_future(stage) for stage in stages]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _render_pipeline(self, image_nodes: List[str]) -> List[Dict]:
+        """
+        Three stages joined by bounded queues: render jobs (every batch in every
+        format), render workers that turn a job into image URLs, and download
+        workers that fetch them. Both formats and later batches are rendered
+        while earlier images download, so the export takes about as long as its
+        slowest stage rather than the sum of all of them.
+        """
+        batches = [image_nodes[i:i+BATCH_SIZE] for i in range(0, len(image_nodes), BATCH_SIZE)]
+        responses = [{} for _ in batches]
+        downloaded = {format_type: 0 for format_type, _ in RENDER_FORMATS}
+        render_queue = asyncio.Queue(maxsize=RENDER_CONCURRENCY)
+        download_queue = asyncio.Queue(maxsize=DOWNLOAD_QUEUE_SIZE)
+        download_workers = self.client.concurrency
+        
+        async def feed_renders():
+            for index in range(len(batches)):
+                for format_type, scale in RENDER_FORMATS:
+                    await render_queue.put((index, format_type, scale))
+            for _ in range(RENDER_CONCURRENCY):
+                await render_queue.put(None)
+        
+        async def render_worker():
+            while True:
+                job = await render_queue.get()
+                if job is None:
+                    return
+                index, format_type, scale = job
+                batch = batches[index]
+                self.log(f"📦 Rendering batch {index + 1}/{len(batches)} as {format_type.upper()}: {len(batch)} nodes")
+                
+                ids_param = ','.join(batch)
+                endpoint = f"images/{self.file_key}?ids={ids_param}&format={format_type}&scale={scale}"
+                response = await self._request(endpoint)
+                responses[index][format_type] = response
+                if not (response and 'images' in response):
+                    self.failed_nodes.update(batch)
+                    continue
+                
+                for node_id, image_url in response['images'].items():
+                    if image_url:
+                        # Blocks while downloads are behind, holding back further render requests
+                        await download_queue.put((node_id, image_url, format_type))
+                    else:
+                        self.failed_nodes.add(node_id)
+        
+        async def render_stage():
+            await self._run_stages(*(render_worker() for _ in range(RENDER_CONCURRENCY)))
+            for _ in range(download_workers):
+                await download_queue.put(None)
+        
+        async def download_worker():
+            while True:
+                item = await download_queue.get()
+                if item is None:
+                    return
+                node_id, image_url, format_type = item
+                if await self._download_image(image_url, node_id, format_type):
+                    downloaded[format_type] += 1
+        
+        try:
+            await self._run_stages(feed_renders(), render_stage(),
+                                   *(download_worker() for _ in range(download_workers)))
+        finally:
+            self.asset_store.save()
+        
+        self.log("📥 Successfully downloaded " + ", ".join(
+            f"{count} {format_type.upper()}" for format_type, count in downloaded.items()) + " images")
+        
+        # Save image manifests, merged across batches
+        for format_type, _ in RENDER_FORMATS:
+            images = {}
+            for batch_responses in responses:
+                response = batch_responses.get(format_type) or {}
+                images.update(response.get('images') or {})
+            manifest_file = self.figma_data_dir / f"images_manifest_{format_type}.json"
+            with open(manifest_file, 'w') as f:
+                json.dump({'err': None, 'images': images}, f, indent=2)
+        
+        return [
+            {
+                'batch': index + 1,
+                'nodes': batch,
+                **{format_type: responses[index].get(format_type) for format_type, _ in RENDER_FORMATS}
+            }
+            for index, batch in enumerate(batches)
+        ]
+    
+    def sync_assets(self) -> Dict:
+        """Incremental download: only re-render image nodes added or changed since the last sync"""
+        self.log("🔄 STARTING INCREMENTAL SYNC...")
+        state = SyncState(self.figma_data_dir / f"sync_state_{self.file_key}.json")
+        
+        # Step 1: One shallow call tells whether anything changed at all
+        metadata = self.make_request(f"files/{self.file_key}?depth=1")
+        if not metadata:
+            self.log("❌ Failed to get file metadata")
+            return {"success": False, "error": "Failed to get file metadata"}
+        if state.is_current(metadata):
+            self.log(f"✅ Up to date at version {state.version} ({state.last_modified})")
+            return {"success": True, "up_to_date": True, "version": state.version, "total_nodes": 0}
+        
+        # Step 2: Fetch the tree and diff it against the stored hashes
+        scan = self.scan_file_data(expected_version=metadata.get('version'))
+        if not scan:
+            self.log("❌ Failed to get file data")
+            return {"success": False, "error": "Failed to get file data"}
+        
+        image_nodes = changed_nodes(scan.hashes, state.hashes, scan.image_nodes)
+        self.log(f"🔍 {len(image_nodes)} image nodes added or changed since version {state.version or 'none'}")
+        
+        # Step 3: Render only those, then remember what was synced
+        self.failed_nodes.clear()
+        results = self._download_batches(image_nodes)
+        state.update(scan.metadata, scan.hashes, scan.parents, self.failed_nodes)
+        state.save()
+        
+        if self.failed_nodes:
+            self.log(f"⚠️  {len(self.failed_nodes)} nodes failed and will be retried on the next sync")
+        self.log(f"🎉 SYNC COMPLETE! Version {scan.metadata.get('version')}, {len(image_nodes)} nodes re-rendered")
+        
+        return {
+            'success': not self.failed_nodes,
+            'up_to_date': False,
+            'version': scan.metadata.get('version'),
+            'total_nodes': len(image_nodes),
+            'failed_nodes': sorted(self.failed_nodes),
+            'results': results
+        }
 
 
 def main():
@@ -311,15 +580,20 @@ def main():
     print("🎨 P360 FIGMA ASSET DOWNLOADER")
     print("=" * 50)
     
+    # --offline may appear anywhere on the command line
+    args = [arg for arg in sys.argv if arg != '--offline']
+    offline = len(args) != len(sys.argv)
+    
+    downloader = None
     try:
-        downloader = FigmaAssetDownloader()
+        downloader = FigmaAssetDownloader(offline=offline)
         
-        if len(sys.argv) > 1:
-            command = sys.argv[1].lower()
+        if len(args) > 1:
+            command = args[1].lower()
             
             if command == "single":
                 # Test with single asset
-                node_id = sys.argv[2] if len(sys.argv) > 2 else None
+                node_id = args[2] if len(args) > 2 else None
                 result = downloader.download_single_asset(node_id)
                 print(f"\n✅ Single asset download result: {result}")
                 
@@ -331,21 +605,41 @@ def main():
                 else:
                     print(f"\n❌ Download failed: {result.get('error', 'Unknown error')}")
                     
+            elif command == "sync":
+                # Re-render only what changed since the last sync
+                result = downloader.sync_assets()
+                if result.get('up_to_date'):
+                    print(f"\n✅ Already up to date at version {result['version']}")
+                elif result['success']:
+                    print(f"\n🎉 Synced {result['total_nodes']} changed nodes!")
+                elif 'error' in result:
+                    print(f"\n❌ Sync failed: {result['error']}")
+                else:
+                    print(f"\n⚠️  Sync incomplete: {len(result['failed_nodes'])} nodes failed")
+                    
+            elif command == "dedupe":
+                # Link identical renders already in assets/ to shared blobs
+                downloader.deduplicate_assets()
+                print("\n♻️  Asset deduplication complete!")
+                    
             elif command == "analyze":
                 # Just analyze file structure
-                file_data = downloader.get_file_data()
+                file_data = downloader.scan_file_data()
                 if file_data:
                     print("\n📊 File analysis complete!")
                 else:
                     print("\n❌ Analysis failed!")
             else:
                 print(f"❌ Unknown command: {command}")
-                print("Available commands: single, all, analyze")
+                print("Available commands: single, all, sync, analyze, dedupe")
         else:
             print("📋 USAGE:")
             print("  python figma_asset_downloader.py single [node_id]  # Test single asset")
             print("  python figma_asset_downloader.py all              # Download all assets")
+            print("  python figma_asset_downloader.py sync             # Download changed assets only")
             print("  python figma_asset_downloader.py analyze          # Analyze file only")
+            print("  python figma_asset_downloader.py dedupe           # Deduplicate downloaded assets")
+            print("  Add --offline to any command to serve file data from .figma-cache only")
             print("\n🔧 Starting with single asset test...")
             
             # Default: single asset test
@@ -355,6 +649,9 @@ def main():
     except Exception as e:
         print(f"❌ Fatal error: {e}")
         sys.exit(1)
+    finally:
+        if downloader:
+            downloader.close()
 
 
 if __name__ == "__main__":
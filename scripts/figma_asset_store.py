@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+P360 Figma Asset Store
+======================
+Content-addressed storage for rendered Figma assets. Each distinct render is
+written once to assets/.blobs/<sha[:2]>/<sha><ext>, and the familiar
+assets/<node_id>.<format> paths are hardlinks to it (symlinks, then copies,
+where the filesystem cannot hardlink). index.json maps each asset name to
+the hash of its content.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Tuple
+
+INDEX_VERSION = 1
+
+
+class AssetStore:
+    """Deduplicating store behind the assets directory"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blob_dir = self.root / '.blobs'
+        self.index_path = self.blob_dir / 'index.json'
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.assets: Dict[str, Dict] = self._load_index()
+        self.bytes_written = 0
+        self.bytes_deduplicated = 0
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get('version') != INDEX_VERSION:
+            return {}
+        return index.get('assets', {})
+
+    def blob_path(self, digest: str, suffix: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}{suffix}"
+
+    def put_bytes(self, name: str, data: bytes) -> Tuple[str, bool]:
+        """Store data under an asset name; returns (sha256, whether a new blob was written)"""
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self.blob_path(digest, Path(name).suffix)
+
+        created = not blob.exists()
+        if created:
+            blob.parent.mkdir(exist_ok=True)
+            temp = blob.with_name(f".{blob.name}.tmp")
+            with open(temp, 'wb') as f:
+                f.write(data)
+            os.replace(temp, blob)
+            self.bytes_written += len(data)
+        else:
+            self.bytes_deduplicated += len(data)
+
+        self._link(blob, self.root / name)
+        self.assets[name] = {'sha256': digest, 'size': len(data)}
+        return digest, created
+
+    def adopt(self, path: Path) -> Tuple[str, bool]:
+        """Move an existing file under the root into the store, linking it back in place"""
+        path = Path(path)
+        entry = self.assets.get(path.name)
+        if entry:
+            blob = self.blob_path(entry['sha256'], path.suffix)
+            if blob.exists() and os.path.samefile(blob, path):
+                return entry['sha256'], False
+        return self.put_bytes(path.name, path.read_bytes())
+
+    def _link(self, blob: Path, target: Path):
+        """Point target at blob, replacing whatever is there atomically"""
+        if target.exists() and os.path.samefile(blob, target):
+            return
+        temp = target.with_name(f".{target.name}.tmp")
+        if temp.exists() or temp.is_symlink():
+            temp.unlink()
+        try:
+            os.link(blob, temp)
+        except OSError:
+            try:
+                temp.symlink_to(os.path.relpath(blob, target.parent))
+            except OSError:
+                shutil.copyfile(blob, temp)
+        os.replace(temp, target)
+
+    def collect_garbage(self) -> int:
+        """Remove blobs no indexed asset refers to; returns how many were removed"""
+        referenced = {self.blob_path(entry['sha256'], Path(name).suffix)
+                      for name, entry in self.assets.items()}
+        removed = 0
+        for blob in self.blob_dir.glob('??/*'):
+            if blob not in referenced:
+                blob.unlink()
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        blobs = {entry['sha256'] for entry in self.assets.values()}
+        logical = sum(entry['size'] for entry in self.assets.values())
+        unique = sum({entry['sha256']: entry['size'] for entry in self.assets.values()}.values())
+        return {
+            'assets': len(self.assets),
+            'blobs': len(blobs),
+            'logical_bytes': logical,
+            'stored_bytes': unique,
+        }
+
+    def save(self):
+        """Write the name -> hash index atomically"""
+        temp = self.index_path.with_name(f".{self.index_path.name}.tmp")
+        with open(temp, 'w') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'updated_at': datetime.now().isoformat(),
+                'assets': self.assets,
+            }, f, indent=2, sort_keys=True)
+        os.replace(temp, self.index_path)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+P360 Figma Response Cache
+=========================
+Python side of the shared .figma-cache/ directory used by the Node scripts.
+Entries keep their layout: <fileKey>_<nodeId|full>_<timestamp>.json holding
+{timestamp, fileKey, nodeId, data}, plus an optional etag for revalidation.
+
+An entry is fresh for `ttl` seconds after it was fetched or last revalidated
+(the timestamp in its name). Stale entries are revalidated with If-None-Match
+when they carry an ETag. The directory is kept under `max_bytes` by evicting
+the least recently used entries, tracked through file mtimes.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    """One cached response on disk"""
+    path: Path
+    file_key: str
+    node_key: str
+    timestamp: int
+
+    @property
+    def age(self) -> float:
+        """Seconds since the entry was fetched or last revalidated"""
+        return max(0.0, time.time() - self.timestamp / 1000)
+
+
+def node_key(node_id: Optional[str]) -> str:
+    """The nodeId part of a cache name, in the Node scripts' '861-20083' form"""
+    return node_id.replace(':', '-') if node_id else 'full'
+
+
+def parse_entry(path: Path) -> Optional[CacheEntry]:
+    """A CacheEntry for a cache file name, or None for other files in the directory"""
+    if path.suffix != '.json':
+        return None
+    parts = path.stem.rsplit('_', 2)
+    if len(parts) != 3 or not parts[2].isdigit():
+        return None
+    return CacheEntry(path, parts[0], parts[1], int(parts[2]))
+
+
+class ResponseCache:
+    """TTL, ETag and size-bounded LRU cache over .figma-cache/"""
+
+    def __init__(self, directory: Path = Path('.figma-cache'), ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _entries(self) -> List[CacheEntry]:
+        entries = (parse_entry(path) for path in self.directory.iterdir())
+        return [entry for entry in entries if entry is not None]
+
+    def lookup(self, file_key: str, node_id: Optional[str]) -> Optional[CacheEntry]:
+        """The newest entry for a file and node, if any"""
+        key = node_key(node_id)
+        matches = [entry for entry in self._entries()
+                   if entry.file_key == file_key and entry.node_key == key]
+        return max(matches, key=lambda entry: entry.timestamp, default=None)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age < self.ttl
+
+    def touch(self, entry: CacheEntry):
+        """Mark an entry as just used, for LRU eviction"""
+        os.utime(entry.path)
+
+    def revalidate(self, entry: CacheEntry) -> CacheEntry:
+        """The server confirmed the entry (304): restart its TTL by renaming it"""
+        timestamp = int(time.time() * 1000)
+        path = entry.path.with_name(f"{entry.file_key}_{entry.node_key}_{timestamp}.json")
+        os.replace(entry.path, path)
+        fresh = CacheEntry(path, entry.file_key, entry.node_key, timestamp)
+        self.touch(fresh)
+        return fresh
+
+    @contextmanager
+    def open_entry(self, file_key: str, node_id: Optional[str],
+                   etag: Optional[str] = None) -> Iterator[BinaryIO]:
+        """
+        Write a new entry by streaming the raw response body into the returned
+        file. The entry replaces older ones for the same file and node when the
+        block exits cleanly, and is discarded if it raises.
+        """
+        timestamp = int(time.time() * 1000)
+        key = node_key(node_id)
+        path = self.directory / f"{file_key}_{key}_{timestamp}.json"
+        temp = path.with_name(f".{path.name}.tmp")
+        header = {'timestamp': timestamp, 'fileKey': file_key, 'nodeId': node_id}
+        if etag:
+            header['etag'] = etag
+        try:
+            with open(temp, 'wb') as f:
+                # The body is spliced in verbatim as the value of "data"
+                f.write(json.dumps(header, separators=(',', ':'))[:-1].encode() + b',"data":')
+                yield f
+                f.write(b'}')
+            os.replace(temp, path)
+        finally:
+            temp.unlink(missing_ok=True)
+
+        for old in self._entries():
+            if old.file_key == file_key and old.node_key == key and old.path != path:
+                old.path.unlink(missing_ok=True)
+        self.evict(keep=path)
+
+    def etag(self, entry: CacheEntry) -> Optional[str]:
+        """The entry's ETag, read from its header without parsing the body"""
+        with open(entry.path, 'rb') as f:
+            head = f.read(4096)
+        # Only the entry header, never the response body, can hold it
+        data = head.find(b'"data"')
+        marker = head.find(b'"etag":', 0, data if data >= 0 else len(head))
+        if marker < 0:
+            return None
+        try:
+            value, _ = json.JSONDecoder().raw_decode(head[marker + 7:].decode('utf-8', 'replace').lstrip())
+        except ValueError:
+            return None
+        return value if isinstance(value, str) else None
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Drop least recently used entries until the cache fits max_bytes; returns how many"""
+        sized = []
+        for entry in self._entries():
+            stat = entry.path.stat()
+            sized.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in sized)
+        removed = 0
+        for _, size, path in sorted(sized):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+P360 Figma HTTP Client
+======================
+Async transport for the Figma REST API. API calls and image downloads share
+one pooled keep-alive session, and downloads run with bounded concurrency.
+API calls draw from a shared AdaptiveRateLimiter; 429s and 5xx responses are
+retried with jittered exponential backoff, honouring Retry-After.
+"""
+
+import asyncio
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+from figma_rate_limit import RETRY_STATUSES, AdaptiveRateLimiter, backoff_delay, parse_retry_after
+
+DEFAULT_BASE_URL = "https://api.figma.com/v1"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RETRIES = 5
+CHUNK_SIZE = 256 * 1024
+
+
+class FigmaRequestError(Exception):
+    """A Figma API call or image download that did not succeed"""
+
+    def __init__(self, message: str, status: Optional[int] = None, body: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+class FigmaClient:
+    """Pooled aiohttp session for the Figma API and its rendered image URLs"""
+
+    def __init__(self, api_token: str, base_url: str = DEFAULT_BASE_URL,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = 60.0,
+                 limiter: Optional[AdaptiveRateLimiter] = None, max_retries: int = DEFAULT_RETRIES):
+        self.base_url = base_url.rstrip('/')
+        self.api_headers = {'X-Figma-Token': api_token}
+        self.concurrency = concurrency
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.max_retries = max_retries
+        self.retries = 0
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._downloads: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "FigmaClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """The shared session, created on first use inside the running loop"""
+        if self._session is None or self._session.closed:
+            # One connection per concurrent download plus headroom for API calls
+            connector = aiohttp.TCPConnector(limit=self.concurrency + 4, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._downloads = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def _backoff(self, attempt: int, retry_after: Optional[float] = None):
+        self.retries += 1
+        await asyncio.sleep(retry_after if retry_after is not None else backoff_delay(attempt))
+
+    async def get_json(self, endpoint: str) -> Dict[str, Any]:
+        """GET an API endpoint relative to the base URL and decode the JSON body"""
+        _, data, _ = await self.request_json(endpoint)
+        return data
+
+    async def request_json(self, endpoint: str,
+                           etag: Optional[str] = None) -> Tuple[int, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        GET an API endpoint, revalidating with If-None-Match when etag is given.
+        Returns (status, decoded body or None on 304, the response ETag)
+        """
+        session = self._get_session()
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = dict(self.api_headers)
+        if etag:
+            headers['If-None-Match'] = etag
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            retry = attempt < self.max_retries
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status in RETRY_STATUSES and retry:
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        if response.status == 429:
+                            # The limiter pauses every caller, not just this one
+                            self.limiter.on_throttle(retry_after if retry_after is not None
+                                                     else backoff_delay(attempt))
+                            self.retries += 1
+                        else:
+                            await self._backoff(attempt, retry_after)
+                        continue
+                    if response.status >= 400:
+                        body = await response.text()
+                        raise FigmaRequestError(f"{response.status} {response.reason} for {endpoint}",
+                                                response.status, body)
+                    self.limiter.on_success()
+                    if response.status == 304:
+                        return response.status, None, response.headers.get('ETag', etag)
+                    data = await response.json(content_type=None)
+                    return response.status, data, response.headers.get('ETag')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not retry:
+                    raise FigmaRequestError(f"{type(e).__name__} for {endpoint}: {e}") from e
+                await self._backoff(attempt)
+
+    async def stream_json(self, endpoint: str, open_sink: Callable[[Optional[str]], BinaryIO],
+                          etag: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        """
+        GET an API endpoint and copy the raw body into open_sink(etag) chunk by
+        chunk, without decoding it. Returns (status, ETag); on 304 the sink is
+        never opened. Failures before the body starts are retried like get_json.
+        """
+        session = self._get_session()
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        headers = dict(self.api_headers)
+        if etag:
+            headers['If-None-Match'] = etag
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            retry = attempt < self.max_retries
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status in RETRY_STATUSES and retry:
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        if response.status == 429:
+                            self.limiter.on_throttle(retry_after if retry_after is not None
+                                                     else backoff_delay(attempt))
+                            self.retries += 1
+                        else:
+                            await self._backoff(attempt, retry_after)
+                        continue
+                    if response.status >= 400:
+                        body = await response.text()
+                        raise FigmaRequestError(f"{response.status} {response.reason} for {endpoint}",
+                                                response.status, body)
+                    self.limiter.on_success()
+                    if response.status == 304:
+                        return response.status, response.headers.get('ETag', etag)
+                    new_etag = response.headers.get('ETag')
+                    sink = open_sink(new_etag)
+                    # A partial body cannot be retried into the same sink
+                    try:
+                        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                            sink.write(chunk)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        raise FigmaRequestError(f"{type(e).__name__} reading {endpoint}: {e}") from e
+                    return response.status, new_etag
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not retry:
+                    raise FigmaRequestError(f"{type(e).__name__} for {endpoint}: {e}") from e
+                await self._backoff(attempt)
+
+    async def fetch(self, url: str) -> bytes:
+        """The body of a rendered image, fetched at most `concurrency` at a time"""
+        session = self._get_session()
+        async with self._downloads:
+            for attempt in range(self.max_retries + 1):
+                retry = attempt < self.max_retries
+                try:
+                    # Render URLs point at Figma's image CDN, which must not see the API token
+                    # and is not subject to the API rate limit
+                    async with session.get(url) as response:
+                        if response.status in RETRY_STATUSES and retry:
+                            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        elif response.status >= 400:
+                            raise FigmaRequestError(f"{response.status} {response.reason} downloading {url}",
+                                                    response.status)
+                        else:
+                            return await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if not retry:
+                        raise FigmaRequestError(f"{type(e).__name__} downloading {url}: {e}") from e
+                    retry_after = None
+                await self._backoff(attempt, retry_after)
+
+    async def close(self):
+        """Close the pooled session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+P360 Figma Node Store
+=====================
+Compact, indexed copy of a Figma file's node tree for fast structure queries.
+
+While the file is scanned every node gets a row in column arrays: its
+pre-order number, the pre-order number of its last descendant, its parent,
+and interned type and name strings. Written to SQLite, the pre-order
+interval makes "everything under this node" a range scan, and the
+(type, pre) index answers "all COMPONENTs under this frame" without
+touching any other rows. Paths are rebuilt from parent links on demand.
+"""
+
+import os
+import sqlite3
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+STORE_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE strings (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE nodes (
+    pre INTEGER PRIMARY KEY,
+    last INTEGER NOT NULL,
+    parent INTEGER,
+    node_id TEXT NOT NULL,
+    type INTEGER NOT NULL,
+    name INTEGER NOT NULL
+);
+"""
+
+# Built after the bulk insert, which is faster than maintaining them row by row
+_INDEXES = """
+CREATE UNIQUE INDEX strings_by_text ON strings (text);
+CREATE INDEX nodes_by_id ON nodes (node_id);
+CREATE INDEX nodes_by_type ON nodes (type, pre);
+CREATE INDEX nodes_by_name ON nodes (name);
+CREATE INDEX nodes_by_parent ON nodes (parent);
+"""
+
+
+class NodeTable:
+    """Column arrays for every node, indexed by pre-order number, with strings interned"""
+
+    def __init__(self):
+        self.node_ids: List[Optional[str]] = []
+        self.lasts = array('l')
+        self.parents = array('l')  # -1 for the root
+        self.types = array('l')
+        self.names = array('l')
+        self.strings: List[str] = []
+        self.index: Dict[str, int] = {}  # node id -> pre-order number
+        self._interned: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def intern(self, text: str) -> int:
+        string_id = self._interned.get(text)
+        if string_id is None:
+            string_id = self._interned[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def open(self, parent: int) -> int:
+        """Reserve the next pre-order number for a node whose fields are not known yet"""
+        self.node_ids.append(None)
+        self.lasts.append(0)
+        self.parents.append(parent)
+        self.types.append(0)
+        self.names.append(0)
+        return len(self.node_ids) - 1
+
+    def close(self, pre: int, node_id: str, node_type: str, name: str):
+        """Fill in a node once it is complete; every descendant has been numbered by now"""
+        self.node_ids[pre] = node_id
+        self.lasts[pre] = len(self.node_ids) - 1
+        self.types[pre] = self.intern(node_type)
+        self.names[pre] = self.intern(name)
+        self.index[node_id] = pre
+
+    def path(self, pre: int) -> str:
+        names = []
+        while pre >= 0:
+            names.append(self.strings[self.names[pre]])
+            pre = self.parents[pre]
+        return '/' + '/'.join(reversed(names))
+
+
+def write_store(table: NodeTable, path: Path, metadata: Dict[str, str]):
+    """Persist a node table as a fresh SQLite file, replacing any previous one atomically"""
+    path = Path(path)
+    temp = path.with_name(f".{path.name}.tmp")
+    temp.unlink(missing_ok=True)
+    conn = sqlite3.connect(temp)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(_SCHEMA)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                         [('store_version', STORE_VERSION)] + sorted(metadata.items()))
+        conn.executemany("INSERT INTO strings VALUES (?, ?)", enumerate(table.strings))
+        conn.executemany(
+            "INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?)",
+            ((pre, table.lasts[pre], table.parents[pre] if table.parents[pre] >= 0 else None,
+              table.node_ids[pre], table.types[pre], table.names[pre])
+             for pre in range(len(table)))
+        )
+        conn.executescript(_INDEXES)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(temp, path)
+
+
+@dataclass
+class NodeRecord:
+    """A node as returned by NodeStore queries"""
+    pre: int
+    node_id: str
+    type: str
+    name: str
+    path: str
+    descendants: int
+
+
+class NodeStore:
+    """Read-only queries over a node store written by write_store"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"No node store at {self.path}; run the downloader's analyze first")
+        self.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        self._paths: Dict[int, str] = {}
+
+    def __enter__(self) -> "NodeStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def metadata(self) -> Dict[str, str]:
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def _string_id(self, text: str) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM strings WHERE text = ?", (text,)).fetchone()
+        return row[0] if row else None
+
+    def _node_path(self, pre: int) -> str:
+        """Path from the root, memoising every ancestor on the way up"""
+        chain = []
+        while pre is not None and pre not in self._paths:
+            parent, name = self.conn.execute(
+                "SELECT n.parent, s.text FROM nodes n JOIN strings s ON s.id = n.name WHERE n.pre = ?",
+                (pre,)).fetchone()
+            chain.append((pre, name))
+            pre = parent
+        prefix = self._paths.get(pre, '') if pre is not None else ''
+        for node_pre, name in reversed(chain):
+            prefix = self._paths[node_pre] = f"{prefix}/{name}"
+        return prefix
+
+    def _records(self, sql: str, params: tuple) -> Iterator[NodeRecord]:
+        query = f"""
+            SELECT n.pre, n.node_id, t.text, s.text, n.last - n.pre
+            FROM nodes n JOIN strings t ON t.id = n.type JOIN strings s ON s.id = n.name
+            {sql}
+        """
+        for pre, node_id, node_type, name, descendants in self.conn.execute(query, params).fetchall():
+            yield NodeRecord(pre, node_id, node_type, name, self._node_path(pre), descendants)
+
+    def _interval(self, node_id: Optional[str]):
+        if node_id is None:
+            return None
+        row = self.conn.execute("SELECT pre, last FROM nodes WHERE node_id = ?", (node_id,)).fetchone()
+        if row is None:
+            raise KeyError(node_id)
+        return row
+
+    def find(self, node_id: str) -> Optional[NodeRecord]:
+        return next(self._records("WHERE n.node_id = ?", (node_id,)), None)
+
+    def by_type(self, node_type: str, under: Optional[str] = None, limit: int = 100) -> List[NodeRecord]:
+        """Nodes of a type, optionally only descendants of the node `under`"""
+        type_id = self._string_id(node_type)
+        if type_id is None:
+            return []
+        interval = self._interval(under)
+        if interval is None:
+            return list(self._records("WHERE n.type = ? ORDER BY n.pre LIMIT ?", (type_id, limit)))
+        first, last = interval
+        return list(self._records("WHERE n.type = ? AND n.pre > ? AND n.pre <= ? ORDER BY n.pre LIMIT ?",
+                                  (type_id, first, last, limit)))
+
+    def children(self, node_id: str, limit: int = 100) -> List[NodeRecord]:
+        first, _ = self._interval(node_id)
+        return list(self._records("WHERE n.parent = ? ORDER BY n.pre LIMIT ?", (first, limit)))
+
+    def by_path(self, path: str) -> List[NodeRecord]:
+        """Nodes at a '/Document/Page 1/Frame' path, resolved one level at a time"""
+        names = [part for part in path.split('/') if part]
+        if not names:
+            return []
+        frontier = [None]
+        for name in names:
+            name_id = self._string_id(name)
+            if name_id is None:
+                return []
+            level = []
+            for parent in frontier:
+                where = "parent IS NULL" if parent is None else "parent = ?"
+                params = (name_id,) if parent is None else (name_id, parent)
+                level.extend(pre for pre, in self.conn.execute(
+                    f"SELECT pre FROM nodes WHERE name = ? AND {where}", params))
+            frontier = level
+            if not frontier:
+                return []
+        return [record for pre in frontier
+                for record in self._records("WHERE n.pre = ?", (pre,))]
+
+    def by_name(self, pattern: str, under: Optional[str] = None, limit: int = 100) -> List[NodeRecord]:
+        """Nodes whose name matches a SQL LIKE pattern"""
+        interval = self._interval(under) or (-1, 2**62)
+        return list(self._records(
+            "WHERE s.text LIKE ? AND n.pre > ? AND n.pre <= ? ORDER BY n.pre LIMIT ?", (pattern, interval[0], interval[1], limit)))
+
+    def type_counts(self, under: Optional[str] = None) -> Dict[str, int]:
+        interval = self._interval(under) or (-1, 2**62)
+        rows = self.conn.execute(
+            "SELECT t.text, COUNT(*) FROM nodes n JOIN strings t ON t.id = n.type "
+            "WHERE n.pre > ? AND n.pre <= ? GROUP BY n.type ORDER BY COUNT(*) DESC", interval)
+        return dict(rows)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+P360 Figma Node Query
+Answers structure questions over the node store written by the asset downloader
+"""
+
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from figma_node_store import NodeStore
+
+load_dotenv()
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="P360 Figma Node Query")
+    parser.add_argument("--file-key", default=os.getenv('FIGMA_FILE_KEY'),
+                        help="Figma file key (default: FIGMA_FILE_KEY)")
+    parser.add_argument("--db", type=Path,
+                        help="Node store to query (default: figma_data/nodes_<fileKey>.sqlite)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    find_parser = subparsers.add_parser("find", help="Look up a node by id")
+    find_parser.add_argument("node_id", help="Node id, e.g. 861:20083")
+
+    path_parser = subparsers.add_parser("path", help="Look up nodes by path")
+    path_parser.add_argument("path", help="Path such as '/Document/Page 1/Frame'")
+
+    type_parser = subparsers.add_parser("type", help="Nodes of a type, e.g. COMPONENT")
+    type_parser.add_argument("node_type", help="Figma node type")
+    type_parser.add_argument("--under", help="Only descendants of this node id")
+    type_parser.add_argument("--limit", type=int, default=100, help="Maximum results (default: 100)")
+
+    children_parser = subparsers.add_parser("children", help="Direct children of a node")
+    children_parser.add_argument("node_id", help="Parent node id")
+    children_parser.add_argument("--limit", type=int, default=100, help="Maximum results (default: 100)")
+
+    name_parser = subparsers.add_parser("name", help="Nodes whose name matches a pattern")
+    name_parser.add_argument("pattern", help="SQL LIKE pattern, e.g. 'Button%%'")
+    name_parser.add_argument("--under", help="Only descendants of this node id")
+    name_parser.add_argument("--limit", type=int, default=100, help="Maximum results (default: 100)")
+
+    stats_parser = subparsers.add_parser("stats", help="Node counts by type")
+    stats_parser.add_argument("--under", help="Only descendants of this node id")
+
+    args = parser.parse_args(argv)
+    if args.db is None:
+        if not args.file_key:
+            parser.error("pass --db or --file-key, or set FIGMA_FILE_KEY")
+        args.db = Path('figma_data') / f"nodes_{args.file_key}.sqlite"
+    return args
+
+def run_query(store, args):
+    """Run the selected query; returns node records, or a dict of type counts for stats"""
+    if args.command == "find":
+        record = store.find(args.node_id)
+        return [record] if record else []
+    if args.command == "path":
+        return store.by_path(args.path)
+    if args.command == "type":
+        return store.by_type(args.node_type, args.under, args.limit)
+    if args.command == "children":
+        return store.children(args.node_id, args.limit)
+    if args.command == "name":
+        return store.by_name(args.pattern, args.under, args.limit)
+    return store.type_counts(args.under)
+
+def main(argv=None):
+    """Main query function"""
+    args = parse_args(argv)
+
+    try:
+        with NodeStore(args.db) as store:
+            start = time.perf_counter()
+            result = run_query(store, args)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            metadata = store.metadata()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return False
+    except KeyError as e:
+        print(f"❌ Node not found: {e}")
+        return False
+
+    print(f"📁 {metadata.get('name') or args.db.name} (version {metadata.get('version', '?')})")
+    if args.command == "stats":
+        print(f"{sum(result.values())} nodes ({elapsed_ms:.1f} ms)")
+        for node_type, count in result.items():
+            print(f"   {node_type:<20} {count}")
+        return len(result) > 0
+
+    print(f"{len(result)} nodes ({elapsed_ms:.1f} ms)")
+    for record in result:
+        print(f"   {record.node_id:<14} {record.type:<12} {record.path}"
+              + (f"  (+{record.descendants} below)" if record.descendants else ""))
+    return len(result) > 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+P360 Figma Rate Limiting
+========================
+Token bucket shared by every Figma API request. The rate climbs while
+requests succeed and halves when the API answers 429, pausing all callers
+for the Retry-After the server asked for.
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to how the API responds (AIMD)"""
+
+    def __init__(self, rate: float = 5.0, burst: int = 10,
+                 min_rate: float = 0.2, max_rate: float = 20.0, increase: float = 0.1):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.throttled = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        if now <= self._updated:
+            return
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for a token; callers queue on the lock so they are served in order"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self):
+        """Additive increase: probe toward the API's limit while it keeps accepting"""
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: float):
+        """Multiplicative decrease, and hold every caller until Retry-After has passed"""
+        self.throttled += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, now + retry_after)
+        # No tokens accrue while paused
+        self._updated = self._paused_until
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+P360 Figma Streaming Scan
+=========================
+Single-pass, event-based scan of a Figma file response with ijson. The
+document tree is never materialised: each node's own fields are built while
+it is open, and when it closes it is classified (component, frame, image
+fills), hashed for incremental sync and dropped. An explicit stack replaces
+recursion, so arbitrarily deep files cannot hit the recursion limit.
+Every node is also numbered in pre-order into a NodeTable (figma_node_store.py)
+for structure queries.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import ijson
+
+from figma_node_store import NodeTable
+from figma_sync import node_digest
+
+_OPEN = ('start_map', 'start_array')
+_CLOSE = ('end_map', 'end_array')
+
+
+@dataclass
+class FileScan:
+    """Everything one pass over a file response produces"""
+    metadata: Dict[str, Any] = field(default_factory=dict)  # top-level fields except the document
+    components: List[Dict] = field(default_factory=list)
+    frames: List[Dict] = field(default_factory=list)
+    images: List[Dict] = field(default_factory=list)
+    image_nodes: List[str] = field(default_factory=list)
+    hashes: Dict[str, str] = field(default_factory=dict)
+    parents: Dict[str, Optional[str]] = field(default_factory=dict)
+    nodes: NodeTable = field(default_factory=NodeTable)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.nodes)
+
+    def path(self, node_id: str) -> str:
+        """'/Document/Page 1/Frame' style path of a node, built from parent links"""
+        return self.nodes.path(self.nodes.index[node_id])
+
+
+class _OpenNode:
+    __slots__ = ('fields', 'child_ids', 'child_hashes', 'pre', 'in_children')
+
+    def __init__(self, pre: int):
+        self.fields: Dict[str, Any] = {}
+        self.child_ids: List[str] = []
+        self.child_hashes: List[str] = []
+        self.pre = pre
+        self.in_children = False
+
+
+def _build_value(events: Iterator[Tuple[str, Any]], event: str, value: Any) -> Any:
+    """Assemble one complete JSON value starting with (event, value)"""
+    if event == 'start_map':
+        root = {}
+    elif event == 'start_array':
+        root = []
+    else:
+        return value
+    containers = [root]
+    keys = [None]
+    for event, value in events:
+        if event == 'map_key':
+            keys[-1] = value
+            continue
+        if event in _CLOSE:
+            containers.pop()
+            keys.pop()
+            if not containers:
+                break
+            continue
+        if event == 'start_map':
+            item = {}
+        elif event == 'start_array':
+            item = []
+        else:
+            item = value
+        parent = containers[-1]
+        if type(parent) is list:
+            parent.append(item)
+        else:
+            parent[keys[-1]] = item
+        if event in _OPEN:
+            containers.append(item)
+            keys.append(None)
+    return root
+
+
+def _skip_value(events: Iterator[Tuple[str, Any]], event: str):
+    depth = 1 if event in _OPEN else 0
+    while depth:
+        event, _ = next(events)
+        if event in _OPEN:
+            depth += 1
+        elif event in _CLOSE:
+            depth -= 1
+
+
+def _scan_document(events: Iterator[Tuple[str, Any]], scan: FileScan):
+    """Walk the document node tree; the opening start_map has been consumed"""
+    classified = []  # (pre-order number, list, entry) so output keeps document order
+    table = scan.nodes
+    stack = [_OpenNode(table.open(-1))]
+    node = stack[-1]
+    key = None
+    for event, value in events:
+        if key is not None:
+            # The value of a node field
+            if key == 'children' and event == 'start_array':
+                node.in_children = True
+            else:
+                node.fields[key] = _build_value(events, event, value)
+            key = None
+            continue
+
+        if node.in_children:
+            if event == 'start_map':
+                node = _OpenNode(table.open(node.pre))
+                stack.append(node)
+            else:  # end_array
+                node.in_children = False
+            continue
+
+        if event == 'map_key':
+            key = value
+            continue
+
+        # end_map: the node is complete, children included
+        stack.pop()
+        fields = node.fields
+        node_id = fields.get('id')
+        digest = node_digest(fields, node.child_hashes)
+        scan.hashes[node_id] = digest
+        node_type = fields.get('type', 'unknown')
+        table.close(node.pre, node_id, node_type, fields.get('name', 'unnamed'))
+        # Children close before their parent, so parent links are filled in as ids become known
+        for child_id in node.child_ids:
+            scan.parents[child_id] = node_id
+        if stack:
+            stack[-1].child_ids.append(node_id)
+            stack[-1].child_hashes.append(digest)
+        else:
+            scan.parents[node_id] = None
+
+        fills = fields.get('fills') or []
+        if node_type == 'COMPONENT':
+            classified.append((node.pre, scan.components, {'id': node_id, 'name': fields.get('name')}))
+        elif node_type == 'FRAME':
+            classified.append((node.pre, scan.frames, {'id': node_id, 'name': fields.get('name')}))
+        elif 'fills' in fields:
+            for fill in fills:
+                if fill.get('type') == 'IMAGE':
+                    classified.append((node.pre, scan.images, {
+                        'node_id': node_id,
+                        'name': fields.get('name'),
+                        'image_ref': fill.get('imageRef'),
+                    }))
+        if any(fill.get('type') == 'IMAGE' for fill in fills):
+            classified.append((node.pre, scan.image_nodes, node_id))
+
+        if not stack:
+            break
+        node = stack[-1]
+
+    for _, target, entry in sorted(classified, key=lambda item: item[0]):
+        if isinstance(entry, dict):
+            entry['path'] = scan.path(entry.get('id') or entry.get('node_id'))
+        target.append(entry)
+
+
+def scan_file(stream: BinaryIO, wrapper_key: Optional[str] = None) -> FileScan:
+    """
+    Scan a file response read from stream. With wrapper_key, the response is
+    the value of that key in an outer object (as in .figma-cache entries).
+    """
+    events = ijson.basic_parse(stream, use_float=True)
+    scan = FileScan()
+
+    event, _ = next(events)
+    if wrapper_key is not None:
+        # Find the wrapped response, skipping the other entry fields
+        while True:
+            event, key = next(events)
+            if event == 'end_map':
+                raise ValueError(f"No '{wrapper_key}' in cache entry")
+            event, _ = next(events)
+            if key == wrapper_key:
+                break
+            _skip_value(events, event)
+
+    while True:
+        event, key = next(events)
+        if event == 'end_map':
+            break
+        event, value = next(events)
+        if key == 'document' and event == 'start_map':
+            _scan_document(events, scan)
+        else:
+            scan.metadata[key] = _build_value(events, event, value)
+    return scan
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+P360 Figma Incremental Sync
+===========================
+Remembers the file version and a Merkle hash of every node's subtree between
+runs. When the version is unchanged nothing is fetched beyond one metadata
+call. Otherwise the hashes from the new tree (computed while it is streamed,
+see figma_stream.py) are compared with the stored ones, and only added or
+changed image nodes are re-rendered.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+STATE_VERSION = 1
+
+
+def _own_fields(node: Dict) -> bytes:
+    """Canonical encoding of a node without its children"""
+    fields = {key: value for key, value in node.items() if key != 'children'}
+    return json.dumps(fields, sort_keys=True, separators=(',', ':')).encode()
+
+
+def node_digest(fields: Dict, child_hashes: Iterable[str]) -> str:
+    """Merkle hash of a node: its own fields (children excluded) and its children's hashes, in order"""
+    digest = hashlib.blake2b(_own_fields(fields), digest_size=16)
+    for child_hash in child_hashes:
+        digest.update(child_hash.encode())
+    return digest.hexdigest()
+
+
+def changed_nodes(hashes: Dict[str, str], previous: Dict[str, str],
+                  candidates: Iterable[str]) -> List[str]:
+    """Candidate nodes that are new or whose subtree hash differs from the previous sync"""
+    return [node_id for node_id in candidates if previous.get(node_id) != hashes.get(node_id)]
+
+
+class SyncState:
+    """Last synced version and node hashes for one Figma file"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.version: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.hashes: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get('state_version') != STATE_VERSION:
+            return
+        self.version = state.get('version')
+        self.last_modified = state.get('lastModified')
+        self.hashes = state.get('hashes', {})
+
+    def is_current(self, metadata: Dict) -> bool:
+        """Whether the file has not changed since the last complete sync"""
+        return self.version is not None and metadata.get('version') == self.version
+
+    def update(self, file_data: Dict, hashes: Dict[str, str],
+               parents: Dict[str, Optional[str]], failed: Iterable[str] = ()):
+        """
+        Record a sync of file_data, the file's top-level fields (version,
+        lastModified). Failed nodes and their ancestors are left without a
+        hash so the next sync revisits them, and the version is only
+        recorded once nothing failed.
+        """
+        hashes = dict(hashes)
+        failed = list(failed)
+        for node_id in failed:
+            while node_id is not None and node_id in hashes:
+                del hashes[node_id]
+                node_id = parents.get(node_id)
+        self.hashes = hashes
+        self.version = None if failed else file_data.get('version')
+        self.last_modified = file_data.get('lastModified')
+
+    def save(self):
+        temp = self.path.with_name(f".{self.path.name}.tmp")
+        with open(temp, 'w') as f:
+            json.dump({
+                'state_version': STATE_VERSION,
+                'version': self.version,
+                'lastModified': self.last_modified,
+                'synced_at': datetime.now().isoformat(),
+                'hashes': self.hashes,
+            }, f, separators=(',', ':'))
+        os.replace(temp, self.path)
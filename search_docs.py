@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+P360 Document Search
+Builds and queries the full-text index over extracted documentation
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+from extraction import SearchIndex
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="P360 Document Search")
+    parser.add_argument("--index-path", type=Path, help="Location of the index database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    index_parser = subparsers.add_parser("index", help="Index (or re-index changed) Markdown files")
+    index_parser.add_argument(
+        "paths", nargs="*", type=Path, default=[script_dir / "documentation"],
+        help="Files or directories to index (default: documentation/)"
+    )
+    
+    query_parser = subparsers.add_parser("query", help="Search the index")
+    query_parser.add_argument("query", help="Search terms")
+    query_parser.add_argument("--limit", type=int, default=10, help="Maximum hits (default: 10)")
+    
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Main search function"""
+    args = parse_args(argv)
+    
+    with SearchIndex(args.index_path) as index:
+        if args.command == "index":
+            start = time.perf_counter()
+            stats = index.update_paths(args.paths)
+            elapsed = time.perf_counter() - start
+            print(f"Indexed {stats['indexed']}, unchanged {stats['unchanged']}, "
+                  f"removed {stats['removed']} in {elapsed:.2f}s")
+            return True
+        
+        start = time.perf_counter()
+        hits = index.search(args.query, args.limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        print(f"{len(hits)} hits for '{args.query}' ({elapsed_ms:.1f} ms)")
+        for rank, hit in enumerate(hits, 1):
+            print(f"\n{rank}. {Path(hit.path).name} — {hit.label}  (score {hit.score:.2f})")
+            print(f"   {hit.snippet}")
+        return len(hits) > 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from extraction import ExtractionCache, ExtractionOptions, discover_jobs, run_batch
+from extraction.synthetic import make_pdf, make_workbook
+
+
+def _tree(root, pdfs=(), workbooks=()):
+    for name in pdfs:
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        make_pdf(root / name, pages=2)
+    for name in workbooks:
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        make_workbook(root / name, sheets=1, rows=3, cols=2)
+
+
+def _outputs(jobs, out):
+    return sorted(str(Path(job.output_path).relative_to(out)) for job in jobs)
+
+
+def test_discover_jobs_names_outputs_by_stem(tmp_path):
+    src, out = tmp_path / "in", tmp_path / "out"
+    _tree(src, pdfs=["report.pdf"], workbooks=["nested/budget.xlsx"])
+    
+    jobs = discover_jobs(src, out)
+    
+    assert _outputs(jobs, out) == ["nested/budget_extracted.md", "report_extracted.md"]
+    assert {job.extractor for job in jobs} == {"pdf", "excel"}
+
+
+def test_discover_jobs_keeps_suffix_when_stems_collide(tmp_path):
+    src, out = tmp_path / "in", tmp_path / "out"
+    # The same stem in another directory is not a collision
+    _tree(src, pdfs=["report.pdf", "summary.pdf", "archive/report.pdf"], workbooks=["report.xlsx"])
+    
+    assert _outputs(discover_jobs(src, out), out) == [
+        "archive/report_extracted.md",
+        "report.pdf_extracted.md",
+        "report.xlsx_extracted.md",
+        "summary_extracted.md",
+    ]
+
+
+def test_discover_jobs_resolves_chained_collisions(tmp_path):
+    # report.pdf.pdf's stem output is what report.pdf becomes once
+    # disambiguated from report.xlsx
+    src, out = tmp_path / "in", tmp_path / "out"
+    _tree(src, pdfs=["report.pdf", "report.pdf.pdf"], workbooks=["report.xlsx"])
+    
+    outputs = [job.output_path for job in discover_jobs(src, out)]
+    
+    assert len(set(outputs)) == len(outputs) == 3
+
+
+def test_colliding_stems_extract_to_separate_files(tmp_path):
+    src, out = tmp_path / "in", tmp_path / "out"
+    _tree(src, pdfs=["report.pdf"], workbooks=["report.xlsx"])
+    options = ExtractionOptions(cache=ExtractionCache(enabled=False))
+    
+    results = run_batch(discover_jobs(src, out), options, jobs_in_parallel=2)
+    
+    assert all(output.error is None for _, output in results)
+    assert "**Total Pages**: 2" in (out / "report.pdf_extracted.md").read_text()
+    assert "## Sheet:" in (out / "report.xlsx_extracted.md").read_text()
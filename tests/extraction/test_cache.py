@@ -0,0 +1,102 @@
+from PyPDF2 import PdfReader
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, NameObject, NumberObject
+
+from extraction.cache import ExtractionCache, page_digest
+from extraction.pdf_pages import LazyPdf
+from extraction.synthetic import make_pdf
+
+
+def _first_page_digest(path):
+    with LazyPdf(path) as pdf:
+        return page_digest(pdf.page(0))
+
+
+def test_page_digest_covers_inherited_media_box(tmp_path):
+    a = make_pdf(tmp_path / "a.pdf", pages=1)
+    b = tmp_path / "b.pdf"
+    # Same length, so the xref offsets stay valid; the box lives on the root /Pages node
+    b.write_bytes(a.read_bytes().replace(b"/MediaBox [0 0 612 792]", b"/MediaBox [0 0 792 612]"))
+    
+    assert _first_page_digest(a) != _first_page_digest(b)
+
+
+def test_page_digest_covers_crop_box_and_rotation(tmp_path):
+    path = make_pdf(tmp_path / "a.pdf", pages=1)
+    page = PdfReader(path).pages[0]
+    plain = page_digest(page)
+    
+    page[NameObject("/Rotate")] = NumberObject(90)
+    rotated = page_digest(page)
+    page.cropbox.lower_left = (10, 10)
+    cropped = page_digest(page)
+    
+    assert len({plain, rotated, cropped}) == 3
+
+
+def _page_digests(path):
+    with LazyPdf(path) as pdf:
+        return [page_digest(pdf.page(i)) for i in range(len(pdf))]
+
+
+def test_page_digest_ignores_object_numbering(tmp_path):
+    # Same seed, so page 1 is identical; the larger file has a second
+    # intermediate /Pages node, which shifts every page's object number
+    small = make_pdf(tmp_path / "small.pdf", pages=1)
+    large = make_pdf(tmp_path / "large.pdf", pages=40)
+    
+    assert _first_page_digest(small) == _first_page_digest(large)
+
+
+def test_edited_page_changes_only_its_own_digest(tmp_path):
+    a = make_pdf(tmp_path / "a.pdf", pages=3)
+    b = tmp_path / "b.pdf"
+    b.write_bytes(a.read_bytes().replace(b"(Page 2)", b"(Page X)"))
+    
+    before, after = _page_digests(a), _page_digests(b)
+    
+    assert before[0] == after[0] and before[2] == after[2]
+    assert before[1] != after[1]
+
+
+def test_page_digest_covers_shared_font(tmp_path):
+    a = make_pdf(tmp_path / "a.pdf", pages=2)
+    b = tmp_path / "b.pdf"
+    b.write_bytes(a.read_bytes().replace(b"/BaseFont /Helvetica", b"/BaseFont /Helvetixa"))
+    
+    before, after = _page_digests(a), _page_digests(b)
+    
+    assert before[0] != after[0] and before[1] != after[1]
+
+
+def test_page_digest_covers_every_content_stream(tmp_path):
+    page = PdfReader(make_pdf(tmp_path / "a.pdf", pages=1)).pages[0]
+    
+    def streams(*chunks):
+        array = ArrayObject()
+        for chunk in chunks:
+            stream = DecodedStreamObject()
+            stream.set_data(chunk)
+            array.append(stream)
+        page[NameObject("/Contents")] = array
+        return page_digest(page)
+    
+    first = streams(b"BT (one) Tj ET", b"BT (two) Tj ET")
+    
+    assert streams(b"BT (one) Tj ET", b"BT (two) Tj ET") == first
+    assert streams(b"BT (one) Tj ET", b"BT (2) Tj ET") != first
+
+
+def test_page_text_reuses_unchanged_pages(tmp_path):
+    a = make_pdf(tmp_path / "a.pdf", pages=3)
+    b = tmp_path / "b.pdf"
+    b.write_bytes(a.read_bytes().replace(b"(Page 2)", b"(Page X)"))
+    cache = ExtractionCache(tmp_path / "cache")
+    
+    with LazyPdf(a) as pdf:
+        first = [cache.page_text("pdf", pdf.page(i)) for i in range(3)]
+    with LazyPdf(b) as pdf:
+        second = [cache.page_text("pdf", pdf.page(i)) for i in range(3)]
+    
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert second[0] == first[0] and second[2] == first[2]
+    assert "Page X" in second[1]
@@ -0,0 +1,67 @@
+import os
+
+from extraction import ExtractionCache, ExtractionOptions, Manifest, discover_jobs, run_batch
+from extraction.synthetic import make_pdf
+
+
+def _run(src, out, manifest_path, **manifest_args):
+    options = ExtractionOptions(cache=ExtractionCache(enabled=False))
+    manifest = Manifest(manifest_path, **manifest_args)
+    results = run_batch(discover_jobs(src, out), options, manifest=manifest)
+    assert all(output.error is None for _, output in results)
+    return {os.path.basename(job.path): output.skipped for job, output in results}
+
+
+def _inputs(tmp_path):
+    src, out = tmp_path / "in", tmp_path / "out"
+    src.mkdir()
+    make_pdf(src / "a.pdf", pages=2)
+    make_pdf(src / "b.pdf", pages=2, seed=1)
+    return src, out, tmp_path / "manifest.json"
+
+
+def test_unchanged_inputs_are_skipped(tmp_path):
+    src, out, manifest_path = _inputs(tmp_path)
+    
+    assert _run(src, out, manifest_path) == {"a.pdf": False, "b.pdf": False}
+    assert _run(src, out, manifest_path) == {"a.pdf": True, "b.pdf": True}
+    assert _run(src, out, manifest_path, force=True) == {"a.pdf": False, "b.pdf": False}
+
+
+def test_edited_input_is_re_extracted(tmp_path):
+    src, out, manifest_path = _inputs(tmp_path)
+    _run(src, out, manifest_path)
+    
+    make_pdf(src / "b.pdf", pages=3, seed=1)
+    
+    assert _run(src, out, manifest_path) == {"a.pdf": True, "b.pdf": False}
+    assert "**Total Pages**: 3" in (out / "b_extracted.md").read_text()
+
+
+def test_touched_input_is_rehashed_and_skipped(tmp_path):
+    src, out, manifest_path = _inputs(tmp_path)
+    _run(src, out, manifest_path)
+    
+    stat = os.stat(src / "a.pdf")
+    os.utime(src / "a.pdf", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    
+    assert _run(src, out, manifest_path) == {"a.pdf": True, "b.pdf": True}
+    # The new mtime is remembered, so the next run skips on stat() alone
+    assert Manifest(manifest_path).entries[str((out / "a_extracted.md").resolve())]["mtime_ns"] \
+        == os.stat(src / "a.pdf").st_mtime_ns
+
+
+def test_collect_garbage_removes_outputs_of_deleted_inputs(tmp_path):
+    src, out, manifest_path = _inputs(tmp_path)
+    _run(src, out, manifest_path)
+    os.remove(src / "b.pdf")
+    
+    manifest = Manifest(manifest_path)
+    removed = manifest.collect_garbage(src)
+    manifest.save()
+    
+    assert removed == [str((out / "b_extracted.md").resolve())]
+    assert not (out / "b_extracted.md").exists()
+    assert (out / "a_extracted.md").exists()
+    assert manifest.collect_garbage(tmp_path / "elsewhere") == []
+    assert list(Manifest(manifest_path).entries) == [str((out / "a_extracted.md").resolve())]
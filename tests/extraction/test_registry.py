@@ -0,0 +1,35 @@
+import pytest
+
+from extraction.registry import Extractor, MissingBackendError
+
+
+def _extractor(tmp_path, monkeypatch, source):
+    (tmp_path / "fake_backend_extractor.py").write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(__import__("sys").modules, "fake_backend_extractor", raising=False)
+    return Extractor(name="fake", label="Fake", extensions=(".fake",), magic=(),
+                     entry_point="fake_backend_extractor:iter_sections",
+                     backends=("not_installed_backend",))
+
+
+def test_missing_declared_backend_is_reported(tmp_path, monkeypatch):
+    extractor = _extractor(tmp_path, monkeypatch, "import not_installed_backend.sub\n")
+    
+    with pytest.raises(MissingBackendError, match="'not_installed_backend' package") as info:
+        extractor.load()
+    assert isinstance(info.value.__cause__, ImportError)
+
+
+def test_other_import_errors_propagate(tmp_path, monkeypatch):
+    extractor = _extractor(tmp_path, monkeypatch, "from .broken_sibling import helper\n")
+    
+    with pytest.raises(ImportError) as info:
+        extractor.load()
+    assert not isinstance(info.value, MissingBackendError)
+
+
+def test_builtin_entry_points_load():
+    from extraction.registry import extractors
+    
+    for extractor in extractors():
+        assert callable(extractor.load())
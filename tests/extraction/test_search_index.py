@@ -0,0 +1,83 @@
+import sqlite3
+
+from extraction.search_index import (
+    SearchIndex,
+    _decode_postings,
+    _decode_varints,
+    _encode_postings,
+    _encode_varints,
+)
+
+
+def _totals(index):
+    return dict(index.conn.execute("SELECT key, value FROM meta"))
+
+
+def _recount(index):
+    units, length = index.conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM units").fetchone()
+    return {"unit_count": units, "total_length": length}
+
+
+def test_varints_round_trip():
+    values = [0, 1, 127, 128, 300, 16383, 16384, 2 ** 35]
+    
+    assert _decode_varints(_encode_varints(values)) == values
+
+
+def test_postings_round_trip():
+    postings = [(0, [3]), (2, [0, 7, 150]), (9, []), (300, [1, 20000])]
+    
+    assert _decode_postings(_encode_postings(postings)) == postings
+
+
+def test_meta_totals_follow_add_edit_and_remove(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("## Page 1\nalpha beta\n## Page 2\ngamma\n")
+    (docs / "b.md").write_text("intro words here\n## Slide 1\nalpha alpha delta\n")
+    
+    with SearchIndex(tmp_path / "index.sqlite") as index:
+        index.update_paths([docs])
+        assert _totals(index) == _recount(index) == {"unit_count": 4, "total_length": 15}
+        
+        (docs / "a.md").write_text("## Page 1\nalpha\n")
+        index.update_paths([docs])
+        assert _totals(index) == _recount(index) == {"unit_count": 3, "total_length": 11}
+        
+        (docs / "b.md").unlink()
+        assert index.update_paths([docs])["removed"] == 1
+        assert _totals(index) == _recount(index) == {"unit_count": 1, "total_length": 3}
+
+
+def test_totals_backfilled_for_existing_index(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("## Page 1\nalpha beta\n## Page 2\ngamma\n")
+    path = tmp_path / "index.sqlite"
+    with SearchIndex(path) as index:
+        index.update_paths([docs])
+    
+    # An index written before the totals were tracked has no meta table
+    conn = sqlite3.connect(str(path))
+    conn.execute("DROP TABLE meta")
+    conn.commit()
+    conn.close()
+    
+    with SearchIndex(path) as index:
+        assert _totals(index) == _recount(index) == {"unit_count": 2, "total_length": 7}
+
+
+def test_search_ranks_units(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("## Page 1\nbudget pacing report\n## Page 2\nbudget budget budget\n")
+    (docs / "b.md").write_text("## Slide 1\naudience reach\n")
+    
+    with SearchIndex(tmp_path / "index.sqlite") as index:
+        index.update_paths([docs])
+        hits = index.search("budget")
+        
+        assert [hit.label for hit in hits] == ["Page 2", "Page 1"]
+        assert hits[0].path == str((docs / "a.md").resolve())
+        assert hits[0].offsets == [10, 17, 24]
+        assert index.search("nowhere") == []
@@ -0,0 +1,24 @@
+import os
+import stat
+
+from extraction import ExtractionCache, ExtractionOptions, extract_file
+from extraction.synthetic import make_pdf
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_new_output_honours_umask_and_existing_mode_is_kept(tmp_path):
+    from extraction import stream
+    
+    pdf = make_pdf(tmp_path / "doc.pdf", pages=1)
+    output = tmp_path / "doc_extracted.md"
+    options = ExtractionOptions(cache=ExtractionCache(enabled=False))
+    
+    extract_file(str(pdf), str(output), "pdf", None, options)
+    assert _mode(output) == 0o666 & ~stream._UMASK
+    
+    os.chmod(output, 0o640)
+    extract_file(str(pdf), str(output), "pdf", None, options)
+    assert _mode(output) == 0o640